@@ -4,11 +4,56 @@ A real-time dashboard for tracking tasks, growth metrics, and YouTube analytics.
 """
 
 import streamlit as st
+from streamlit.logger import get_logger
+from streamlit.runtime.scriptrunner import RerunException, add_script_run_ctx, get_script_run_ctx
+try:
+    from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+except ImportError:  # Streamlit < 1.38
+    from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
 import requests
+from urllib.parse import parse_qs, urlencode, urlsplit
 from datetime import datetime, timedelta
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+import bisect
+from array import array
+import cProfile
+import contextlib
+import functools
+import hashlib
+import heapq
+import io
+import json
+import queue
+import os
+import pstats
+import random
+import re
+import sqlite3
+import string
+import textwrap
+import threading
+import time
+import tracemalloc
+import numpy as np
 import pytz
 import hmac
 
+try:
+    import orjson  # Optional fast JSON decoder for webhook payloads
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Optional binary transport format for webhook payloads
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli  # Optional: lets urllib3 decode brotli-compressed responses
+except ImportError:
+    brotli = None
+
 # =============================================================================
 # CONFIG & CONSTANTS
 # =============================================================================
@@ -20,9 +65,99 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# API Endpoints
-TASKS_API = "https://n8n-wrightmode-u50335.vm.elestio.app/webhook/tasks"
-YOUTUBE_API = "https://n8n-wrightmode-u50335.vm.elestio.app/webhook/charlie-youtube"
+# API Endpoints (N8N_BASE_URL points the app at another n8n, e.g. a local mock)
+N8N_BASE_URL = os.environ.get("N8N_BASE_URL", "https://n8n-wrightmode-u50335.vm.elestio.app").rstrip("/")
+TASKS_API = f"{N8N_BASE_URL}/webhook/tasks"
+YOUTUBE_API = f"{N8N_BASE_URL}/webhook/charlie-youtube"
+
+# Overall deadline for fetching all data sources on a rerun (seconds)
+FETCH_DEADLINE = 15
+
+# Stale-while-revalidate TTLs per data source (seconds). Past the soft TTL the
+# cached snapshot is still served while it refreshes in the background; past
+# the hard TTL it is dropped and the next rerun waits for a fresh fetch.
+# delta asks upstream for only the entries changed since the last version.
+SOURCE_CONFIG = {
+    "tasks": {"url": TASKS_API, "soft_ttl": 60, "hard_ttl": 900, "delta": True},
+    "youtube": {"url": YOUTUBE_API, "soft_ttl": 300, "hard_ttl": 3600, "delta": False},
+}
+
+# On-disk store of the last good payload per source, read back at startup and
+# served (marked stale) whenever upstream is down (CHARLIE_SNAPSHOT_DB overrides the path)
+SNAPSHOT_DB = os.environ.get(
+    "CHARLIE_SNAPSHOT_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots.sqlite3")
+)
+
+# Bytes read per chunk when streaming a webhook response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Per-endpoint circuit breaker and timeout policy. Timeouts track observed
+# p95 latency (times timeout_factor, clamped); failed calls are retried with
+# jittered exponential backoff while they fit in retry_budget; after
+# failure_threshold consecutive failures the circuit opens and calls fail
+# fast for reset_timeout seconds, then a single half-open trial call decides.
+BREAKER_CONFIG = {
+    "failure_threshold": 3,
+    "reset_timeout": 30,
+    "min_timeout": 2,
+    "max_timeout": 10,
+    "timeout_factor": 3,
+    "retries": 2,
+    "backoff_base": 0.25,
+    "backoff_max": 2,
+    "retry_budget": 12,
+}
+
+# Samples kept per timer for the rolling p50/p95/p99 of the diagnostics panel
+METRICS_WINDOW = 1024
+
+# Prometheus text-format metrics file for the scraper, rewritten at most every
+# METRICS_WRITE_INTERVAL seconds (CHARLIE_METRICS_FILE overrides the path)
+METRICS_FILE = os.environ.get(
+    "CHARLIE_METRICS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics.prom")
+)
+METRICS_WRITE_INTERVAL = 15
+
+# Where ?profile=1 runs save their cProfile stats (CHARLIE_PROFILE_DIR overrides),
+# and how many hotspots / allocation sites the profile panel lists
+PROFILE_DIR = os.environ.get(
+    "CHARLIE_PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+)
+PROFILE_TOP = 25
+
+# Share of reruns traced into TRACE_FILE as Chrome Trace Event JSON (0 turns
+# tracing off, 1 traces every rerun); the file is rotated at TRACE_MAX_BYTES,
+# keeping TRACE_BACKUPS older files (trace.json.1 is the most recent)
+TRACE_SAMPLE_RATE = float(os.environ.get("CHARLIE_TRACE_SAMPLE_RATE", "0.01"))
+TRACE_FILE = os.environ.get(
+    "CHARLIE_TRACE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces", "trace.json")
+)
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUPS = 3
+
+# Minimum seconds between manual refreshes of one source, across all sessions
+REFRESH_MIN_INTERVAL = 15
+
+# How list sections are sent to the browser: "batched" renders each section as
+# one HTML block (one delta), "per-item" sends one st.markdown per card
+RENDER_MODE = "batched"
+
+# Rows per page of each paginated list (more load on "Load more")
+PAGE_SIZES = {
+    "forBrooke": 10,
+    "forCharlie": 10,
+    "activity": 8,
+    "workLog": 10,
+    "reminders": 5,
+}
+
+# Auto-refresh interval of each live panel fragment (seconds)
+LIVE_REFRESH = {
+    "status": 30,
+    "tasks": 60,
+    "activity": 30,
+    "sessions": 20,
+}
 
 # Workshop details
 WORKSHOP_DATE_1 = datetime(2026, 2, 19, 10, 0, 0, tzinfo=pytz.timezone('Australia/Perth'))
@@ -289,24 +424,16 @@ st.markdown("""
         color: #8b5cf6;
     }
     
-    /* Tab styling fix */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
+    /* Page navigation (styled like the old tab bar) */
+    [data-testid="stPageLink-NavLink"] {
         background: rgba(255,255,255,0.05);
-        padding: 5px;
-        border-radius: 10px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background: transparent;
-        color: #888;
         border-radius: 8px;
         padding: 10px 20px;
+        justify-content: center;
     }
     
-    .stTabs [data-baseweb="tab"][aria-selected="true"] {
-        background: #a78bfa;
-        color: #000;
+    [data-testid="stPageLink-NavLink"]:hover {
+        background: rgba(167,139,250,0.2);
     }
     
     /* Section headers */
@@ -326,104 +453,2068 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# =============================================================================
+# INSTRUMENTATION
+# =============================================================================
+# Fetch and render functions report their durations to a process-wide Metrics
+# registry (rolling percentiles per name) alongside event counters. main()
+# exports it, with cache hit ratios, as a Prometheus text file; admins also
+# see it in the sidebar diagnostics panel.
+
+class Metrics:
+    """Thread-safe timers (rolling window plus totals) and counters."""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self._timers = {}  # name -> [recent durations, count, total seconds]
+        self._counters = {}
+        self._written_at = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        """Record one duration of a timer."""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = [deque(maxlen=self.window), 0, 0.0]
+            timer[0].append(seconds)
+            timer[1] += 1
+            timer[2] += seconds
+
+    def count(self, name, n=1):
+        """Add n to a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def timers(self):
+        """{name: {'count', 'sum', 'p50', 'p95', 'p99'}} in seconds, by name."""
+        with self._lock:
+            timers = {name: (list(recent), count, total) for name, (recent, count, total) in self._timers.items()}
+        stats = {}
+        for name, (recent, count, total) in sorted(timers.items()):
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+            stats[name] = {'count': count, 'sum': total, 'p50': p50, 'p95': p95, 'p99': p99}
+        return stats
+
+    def counters(self):
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def prometheus(self, caches=None):
+        """The registry (and {cache: (hits, misses)}) in Prometheus text format."""
+        lines = [
+            "# HELP charlie_duration_seconds Duration of instrumented fetch and render calls.",
+            "# TYPE charlie_duration_seconds summary",
+        ]
+        for name, t in self.timers().items():
+            for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')):
+                lines.append(f'charlie_duration_seconds{{name="{name}",quantile="{quantile}"}} {t[key]:.6f}')
+            lines.append(f'charlie_duration_seconds_sum{{name="{name}"}} {t["sum"]:.6f}')
+            lines.append(f'charlie_duration_seconds_count{{name="{name}"}} {t["count"]}')
+        
+        lines += ["# HELP charlie_events_total Instrumented event counters.", "# TYPE charlie_events_total counter"]
+        lines += [f'charlie_events_total{{name="{name}"}} {value}' for name, value in self.counters().items()]
+        
+        caches = caches or {}
+        lines += ["# HELP charlie_cache_requests_total Cache lookups by result.", "# TYPE charlie_cache_requests_total counter"]
+        for cache, (hits, misses) in caches.items():
+            lines.append(f'charlie_cache_requests_total{{cache="{cache}",result="hit"}} {hits}')
+            lines.append(f'charlie_cache_requests_total{{cache="{cache}",result="miss"}} {misses}')
+        lines += ["# HELP charlie_cache_hit_ratio Share of cache lookups that hit.", "# TYPE charlie_cache_hit_ratio gauge"]
+        for cache, (hits, misses) in caches.items():
+            if hits + misses:
+                lines.append(f'charlie_cache_hit_ratio{{cache="{cache}"}} {hits / (hits + misses):.4f}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, caches=None, interval=METRICS_WRITE_INTERVAL):
+        """Atomically rewrite the Prometheus file, at most once per interval."""
+        with self._lock:
+            if time.time() - self._written_at < interval:
+                return False
+            self._written_at = time.time()
+        try:
+            with open(path + ".tmp", "w") as f:
+                f.write(self.prometheus(caches))
+            os.replace(path + ".tmp", path)
+        except OSError:
+            return False
+        return True
+
+@st.cache_resource
+def get_metrics():
+    """Process-wide instrumentation registry."""
+    return Metrics()
+
+class Trace:
+    """Spans recorded during one sampled rerun, as Chrome trace events.
+
+    Each thread keeps its own stack of open spans, so every span knows its
+    parent; spans in fetch worker threads have the rerun itself as parent.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.pid = os.getpid()
+        self._wall = time.time()
+        self._started = time.perf_counter()
+        self._stacks = {}  # thread id -> names of the open spans
+        self.events = []
+
+    def _ts(self, moment):
+        """Chrome trace timestamp (microseconds) of a perf_counter() moment."""
+        return (self._wall + moment - self._started) * 1e6
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Record the enclosed block as a complete ('X') event on this thread."""
+        tid = threading.get_ident()
+        stack = self._stacks.get(tid)
+        if stack is None:
+            stack = self._stacks[tid] = []
+            self.events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid,
+                'args': {'name': threading.current_thread().name},
+            })
+        parent = stack[-1] if stack else self.name
+        stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self.events.append({
+                'name': name, 'cat': 'charlie', 'ph': 'X', 'pid': self.pid, 'tid': tid,
+                'ts': round(self._ts(started), 3), 'dur': round((time.perf_counter() - started) * 1e6, 3),
+                'args': {'parent': parent},
+            })
+
+    def close(self, **args):
+        """Add the span of the whole rerun (on the calling thread) and return the events."""
+        self.events.append({
+            'name': self.name, 'cat': 'charlie', 'ph': 'X', 'pid': self.pid, 'tid': threading.get_ident(),
+            'ts': round(self._ts(self._started), 3),
+            'dur': round((time.perf_counter() - self._started) * 1e6, 3),
+            'args': args,
+        })
+        return self.events
+
+class Tracer:
+    """Samples reruns for tracing and appends their spans to a rotating trace file.
+
+    The active Trace of a rerun is keyed by its script run context, which the
+    fetch worker threads share, so their spans land in the same trace. The
+    file uses the JSON Array Format, whose closing bracket is optional, so
+    each rerun is appended without rewriting the file; Perfetto and
+    chrome://tracing open it as-is.
+    """
+
+    def __init__(self, path=TRACE_FILE, sample_rate=TRACE_SAMPLE_RATE, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._active = {}  # id of a script run context -> Trace
+        self._lock = threading.Lock()
+
+    def start(self, name="rerun"):
+        """Begin tracing the current rerun if it is sampled; returns its Trace or None."""
+        ctx = get_script_run_ctx()
+        if ctx is None or random.random() >= self.sample_rate:
+            return None
+        trace = self._active[id(ctx)] = Trace(name)
+        return trace
+
+    def current(self):
+        """The Trace of the rerun the calling thread belongs to, if sampled."""
+        if not self._active:
+            return None
+        ctx = get_script_run_ctx(suppress_warning=True)
+        return self._active.get(id(ctx)) if ctx is not None else None
+
+    def finish(self, trace):
+        """Stop tracing the current rerun and append its events to the file."""
+        ctx = get_script_run_ctx()
+        self._active.pop(id(ctx), None)
+        data = "".join(json.dumps(event) + ",\n" for event in trace.close(session=ctx.session_id))
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                    self._rotate()
+                with open(self.path, "a") as f:
+                    if f.tell() == 0:
+                        f.write("[\n")
+                    f.write(data)
+            except OSError as e:
+                fetch_log.warning("Could not write trace to %s: %s", self.path, e)
+
+    def _rotate(self):
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"):
+                os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+@st.cache_resource
+def get_tracer():
+    """Process-wide rerun tracer."""
+    return Tracer()
+
+def timed(fn):
+    """Decorator recording every call's duration under the function's name.
+
+    In a sampled rerun the call is also traced as a span.
+    """
+    metrics = get_metrics()
+    tracer = get_tracer()
+    name = fn.__name__
+    
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        trace = tracer.current()
+        try:
+            if trace is None:
+                return fn(*args, **kwargs)
+            with trace.span(name):
+                return fn(*args, **kwargs)
+        finally:
+            metrics.observe(name, time.perf_counter() - started)
+    return wrapper
+
+def profile_call(fn, path, top=PROFILE_TOP):
+    """Run fn under cProfile and tracemalloc, saving the cProfile stats to path.
+
+    Returns a dict with the top cumulative hotspots (pstats text), the top
+    allocation sites as (file:line, bytes, blocks), the peak traced memory
+    and the exception fn raised, if any (including st.rerun()'s, which the
+    caller re-raises once the profile is saved). Only the calling thread is
+    profiled; fetches running on the executor show up as the time spent
+    waiting for them. Both profilers are process-wide: callers hold
+    get_profile_lock().
+    """
+    profiler = cProfile.Profile()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    error = None
+    try:
+        profiler.runcall(fn)
+    except BaseException as e:
+        error = e
+    try:
+        allocations = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiler.dump_stats(path)
+    hotspots = io.StringIO()
+    pstats.Stats(profiler, stream=hotspots).strip_dirs().sort_stats("cumulative").print_stats(top)
+    return {
+        'path': path,
+        'hotspots': hotspots.getvalue().strip(),
+        'allocations': [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+            for stat in allocations.statistics("lineno")[:top]
+        ],
+        'peak': peak,
+        'error': error,
+    }
+
+@st.cache_resource
+def get_profile_lock():
+    """Process-wide lock letting one profiled run at a time use the profilers."""
+    return threading.Lock()
+
 # =============================================================================
 # DATA FETCHING
 # =============================================================================
 
-@st.cache_data(ttl=60)  # Cache for 60 seconds
+# Decoder for webhook payloads: orjson when installed, else the stdlib
+json_loads = orjson.loads if orjson else json.loads
+
+# Per-fetch transfer log (bytes, encoding, decode time, savings); shown with
+# streamlit run app.py --logger.level=info
+fetch_log = get_logger("charlie.fetch")
+
+# Response formats and encodings offered to upstream, best first
+ACCEPT = "application/msgpack, application/json;q=0.9" if msgpack else "application/json"
+ACCEPT_ENCODING = "br, gzip, deflate" if brotli else "gzip, deflate"
+
+def apply_delta(base, delta, key='id'):
+    """Return a new payload: base with a delta document applied.
+
+    A delta is {"since": <version>, "set": {section: value},
+    "upsert": {section: [items]}, "remove": {section: [ids]}}. Upserted items
+    replace the item with the same id in place; new ones go first, since the
+    lists are newest-first. base itself is left untouched.
+    """
+    payload = dict(base)
+    payload.update(delta.get('set') or {})
+    for section, items in (delta.get('upsert') or {}).items():
+        changed = {item.get(key): item for item in items}
+        kept = [changed.pop(item.get(key), item) for item in payload.get(section, [])]
+        payload[section] = list(changed.values()) + kept
+    for section, ids in (delta.get('remove') or {}).items():
+        ids = set(ids)
+        payload[section] = [item for item in payload.get(section, []) if item.get(key) not in ids]
+    return payload
+
+def json_size(payload):
+    """Size of a payload as compact JSON, the baseline for savings ratios."""
+    return len(json.dumps(payload, separators=(',', ':'), default=str).encode())
+
+# Bytes that matter when scanning JSON outside strings
+_JSON_STRUCTURE = re.compile(rb'["{}\[\],]')
+
+def _decode_member(buf, start, end):
+    member = bytes(buf[start:end])
+    return json_loads(b'{' + member + b'}').items() if member.strip() else ()
+
+def iter_json_sections(chunks):
+    """Yield the (key, value) members of a streamed JSON object as each completes.
+
+    Scans the bytes as they arrive, tracking nesting and strings, and decodes
+    each top-level member as soon as its closing comma or brace is seen, so a
+    short section is available long before a long one that follows it.
+    """
+    buf = bytearray()
+    pos = 0
+    start = None  # Offset of the member being scanned (after '{' or ',')
+    depth = 0
+    in_string = False
+    finished = False
+    for chunk in chunks:
+        buf += chunk
+        while not finished:
+            if in_string:
+                end = buf.find(b'"', pos)
+                if end < 0:
+                    pos = len(buf)
+                    break
+                backslash = end - 1
+                while buf[backslash] == 0x5C:
+                    backslash -= 1
+                pos = end + 1
+                in_string = (end - 1 - backslash) % 2 == 1  # Escaped quote
+                continue
+            
+            match = _JSON_STRUCTURE.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            char = buf[match.start()]
+            pos = match.end()
+            if char == 0x22:  # "
+                in_string = True
+            elif char in b'{[':
+                if depth == 0 and char != 0x7B:
+                    raise ValueError("Expected a JSON object")
+                depth += 1
+                if depth == 1:
+                    start = pos
+            elif char in b'}]':
+                depth -= 1
+                if depth == 0:
+                    finished = True
+                    yield from _decode_member(buf, start, match.start())
+            elif depth == 1:  # Comma between top-level members
+                yield from _decode_member(buf, start, match.start())
+                start = pos
+        
+        if finished:
+            return
+        if start:
+            # Drop the bytes of members already decoded
+            del buf[:start]
+            pos -= start
+            start = 0
+    raise ValueError("Truncated JSON payload")
+
+def iter_msgpack_sections(chunks):
+    """Yield the (key, value) members of a streamed msgpack map as each completes.
+
+    The Unpacker buffers the bytes as they arrive and rolls back to the start
+    of an object that isn't complete yet, so each member is decoded once.
+    """
+    unpacker = msgpack.Unpacker(raw=False, max_buffer_size=0)
+    remaining = None  # Members left in the top-level map (None before its header)
+    pending = key = object()  # No key read yet for the next member
+    for chunk in chunks:
+        unpacker.feed(chunk)
+        try:
+            if remaining is None:
+                remaining = unpacker.read_map_header()
+            while remaining:
+                if key is pending:
+                    key = unpacker.unpack()
+                value = unpacker.unpack()
+                yield key, value
+                key = pending
+                remaining -= 1
+        except msgpack.OutOfData:
+            continue
+        return
+    raise ValueError("Truncated msgpack payload")
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker with a latency-derived timeout.
+
+    Closed: calls go through. After failure_threshold consecutive failures the
+    circuit opens and calls are refused until reset_timeout has passed; then
+    it goes half-open and lets one trial call through, which closes the
+    circuit on success or re-opens it on failure.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, config=BREAKER_CONFIG):
+        self.config = config
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial = False
+        self._latencies = deque(maxlen=100)
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go through now (claims the half-open trial)."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.time() - self.opened_at < self.config['reset_timeout']:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial = False
+            if self.state == self.HALF_OPEN:
+                if self._trial:
+                    return False
+                self._trial = True
+            return True
+
+    def record_success(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.config['failure_threshold']:
+                self.state = self.OPEN
+                self.opened_at = time.time()
+            self._trial = False
+
+    def p95(self):
+        """95th percentile of recent successful call latencies (None until measured)."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < 5:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def timeout(self):
+        """Timeout for the next call: p95 latency times timeout_factor, clamped."""
+        config = self.config
+        p95 = self.p95()
+        if p95 is None:
+            return config['max_timeout']
+        return min(config['max_timeout'], max(config['min_timeout'], p95 * config['timeout_factor']))
+
+def is_retryable(error):
+    """Connection problems, timeouts and 5xx responses are worth retrying."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return isinstance(error, requests.HTTPError) and response is not None and response.status_code >= 500
+
+class WebhookClient:
+    """Keep-alive HTTP client for the n8n webhooks, shared by every session.
+
+    Connections to the n8n host are pooled and reused. The ETag/Last-Modified
+    validators of each response are remembered per URL and sent back as
+    conditional headers, so a 304 reuses the last payload instead of
+    re-downloading it. Each endpoint has a CircuitBreaker that sets its
+    timeout and fails calls fast while the endpoint is down. Cursor pages
+    of an endpoint ('<name>:page') have a breaker of their own and are never
+    revalidated, so the per-URL validators stay bounded by the feeds.
+    
+    Compressed (brotli/gzip) and MessagePack responses are accepted when the
+    optional decoders are installed. In delta mode the last version token is
+    sent as X-Since-Version, and a response marked X-Delta is applied to the
+    last payload. Bytes, decode time and savings of each fetch are logged,
+    and reported to metrics (a Metrics registry) when given.
+    """
+
+    def __init__(self, pool_size=8, breaker_config=BREAKER_CONFIG, metrics=None):
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept": ACCEPT,
+            "Accept-Encoding": ACCEPT_ENCODING,
+        })
+        self._snapshots = {}  # url -> (validators, payload, JSON size)
+        self.transfers = {}  # endpoint name -> stats of its last fetch
+        self._breaker_config = breaker_config
+        self.breakers = {}  # endpoint name -> CircuitBreaker
+        self._metrics = metrics
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_paged(url):
+        """Whether a URL requests a cursor page of a list."""
+        return 'cursor' in parse_qs(urlsplit(url).query)
+
+    @classmethod
+    def endpoint(cls, url):
+        """Endpoint name of a URL (its last path segment, ':page' for cursor pages)."""
+        name = urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1]
+        return f"{name}:page" if cls.is_paged(url) else name
+
+    def breaker(self, url):
+        """The circuit breaker of a URL's endpoint."""
+        endpoint = self.endpoint(url)
+        with self._lock:
+            breaker = self.breakers.get(endpoint)
+            if breaker is None:
+                breaker = self.breakers[endpoint] = CircuitBreaker(self._breaker_config)
+            return breaker
+
+    def get_json(self, url, timeout=None, on_section=None, delta=False):
+        """GET a JSON payload through the endpoint's breaker, retrying with backoff.
+
+        Raises CircuitOpenError without touching the network while the
+        endpoint's circuit is open. timeout overrides the adaptive timeout.
+        With on_section, the response is streamed and on_section(key, value)
+        is called for each top-level member as soon as it has been parsed.
+        With delta, upstream may answer with only the changes since the last
+        version of this URL.
+        """
+        breaker = self.breaker(url)
+        config = self._breaker_config
+        started = time.monotonic()
+        for attempt in range(config['retries'] + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {url} (upstream failing, retrying later)")
+            call_timeout = timeout or breaker.timeout()
+            call_started = time.monotonic()
+            try:
+                payload = self._get_json(url, call_timeout, on_section, delta)
+            except Exception as e:
+                breaker.record_failure()
+                if self._metrics:
+                    self._metrics.count(f"http.{self.endpoint(url)}.errors")
+                # Full jitter: sleep a random slice of the exponential backoff
+                delay = random.uniform(0, min(config['backoff_max'], config['backoff_base'] * 2 ** attempt))
+                fits = time.monotonic() - started + delay + call_timeout <= config['retry_budget']
+                if attempt == config['retries'] or breaker.state == breaker.OPEN or not is_retryable(e) or not fits:
+                    raise
+                time.sleep(delay)
+            else:
+                latency = time.monotonic() - call_started
+                breaker.record_success(latency)
+                if self._metrics:
+                    self._metrics.observe(f"http.{self.endpoint(url)}", latency)
+                return payload
+
+    def _get_json(self, url, timeout, on_section=None, delta=False):
+        """GET a payload, revalidating (or patching) the last snapshot of this URL."""
+        cacheable = not self.is_paged(url)
+        with self._lock:
+            snapshot = self._snapshots.get(url) if cacheable else None
+        
+        headers = {}
+        if snapshot:
+            validators = snapshot[0]
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+            if delta and validators.get('version'):
+                headers['X-Since-Version'] = validators['version']
+        
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and snapshot:
+                self._log_transfer(url, response, 0, snapshot[2], 0.0, "not modified")
+                return snapshot[1]  # Unchanged upstream - keep the cached snapshot
+            response.raise_for_status()
+            
+            binary = 'msgpack' in response.headers.get('Content-Type', '')
+            is_delta = bool(response.headers.get('X-Delta'))
+            # Plain JSON size of the full payload, when upstream reports it
+            reported = response.headers.get('X-Json-Length', '')
+            json_bytes = int(reported) if reported.isdigit() else None
+            streamed = on_section is not None and not is_delta
+            waited = 0.0  # Seconds spent reading, rendering or sizing, not decoding
+            if streamed:
+                sizes = []  # Decoded chunk sizes: the body's size
+                
+                def read_chunks():
+                    nonlocal waited
+                    chunks = response.iter_content(STREAM_CHUNK_SIZE)
+                    while True:
+                        t0 = time.perf_counter()
+                        chunk = next(chunks, None)
+                        waited += time.perf_counter() - t0
+                        if chunk is None:
+                            return
+                        sizes.append(len(chunk))
+                        yield chunk
+                
+                started = time.perf_counter()
+                payload = {}
+                sections = iter_msgpack_sections if binary else iter_json_sections
+                members = []  # JSON sizes of the members, taken before on_section normalizes them
+                for key, value in sections(read_chunks()):
+                    payload[key] = value
+                    t0 = time.perf_counter()
+                    if binary and json_bytes is None:
+                        members.append(json_size({key: value}) - 1)  # '"key":value' plus its ',' or '}'
+                    on_section(key, value)
+                    waited += time.perf_counter() - t0
+                body_bytes = sum(sizes)
+            else:
+                body = response.content
+                body_bytes = len(body)
+                started = time.perf_counter()
+                payload = msgpack.unpackb(body, raw=False) if binary else json_loads(body)
+            
+            if is_delta:
+                if not snapshot or payload.get('since') != snapshot[0].get('version'):
+                    # Upstream diffed against a version we don't have: refetch in full
+                    return self._get_json(url, timeout, on_section)
+                payload = apply_delta(snapshot[1], payload)
+            decode_seconds = time.perf_counter() - started - waited
+            wire_bytes = response.raw.tell()
+        
+        # Plain JSON size: the body itself unless it was binary or a delta,
+        # else what upstream reported, else the payload encoded as JSON
+        if not (binary or is_delta):
+            full_bytes = body_bytes
+        elif json_bytes is not None:
+            full_bytes = json_bytes
+        elif streamed:
+            full_bytes = max(2, 1 + sum(members))
+        else:
+            full_bytes = json_size(payload)
+        kind = ("delta " if is_delta else "") + ("msgpack" if binary else "json")
+        self._log_transfer(url, response, wire_bytes, full_bytes, decode_seconds, kind)
+        
+        if on_section is not None and not streamed:
+            for key, value in payload.items():
+                on_section(key, value)
+        
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'version': response.headers.get('X-Payload-Version'),
+        }
+        with self._lock:
+            if cacheable and any(validators.values()):
+                self._snapshots[url] = (validators, payload, full_bytes)
+            else:
+                self._snapshots.pop(url, None)
+        return payload
+
+    def version(self, url):
+        """Version upstream sent with the last payload of url (X-Payload-Version, else ETag), or None."""
+        with self._lock:
+            snapshot = self._snapshots.get(url)
+        if snapshot is None:
+            return None
+        return snapshot[0].get('version') or snapshot[0].get('etag')
+
+    def _log_transfer(self, url, response, wire_bytes, full_bytes, decode_seconds, kind):
+        """Record and log the bytes, encoding, decode time and savings of a fetch."""
+        encoding = response.headers.get('Content-Encoding', 'identity')
+        saved = 1 - wire_bytes / full_bytes if full_bytes else 0.0
+        endpoint = self.endpoint(url)
+        self.transfers[endpoint] = {
+            'kind': kind,
+            'encoding': encoding,
+            'wire_bytes': wire_bytes,
+            'json_bytes': full_bytes,
+            'decode_ms': decode_seconds * 1000,
+            'saved': saved,
+        }
+        if self._metrics:
+            self._metrics.observe(f"decode.{endpoint}", decode_seconds)
+            self._metrics.count(f"http.{endpoint}.wire_bytes", wire_bytes)
+            self._metrics.count(f"http.{endpoint}.json_bytes", full_bytes or 0)
+        fetch_log.info(
+            "%s: %s, %d bytes on the wire (%s) for %d bytes of JSON, decoded in %.1f ms, %.0f%% saved",
+            endpoint, kind, wire_bytes, encoding, full_bytes or 0, decode_seconds * 1000, saved * 100,
+        )
+
+@st.cache_resource
+def get_http_client():
+    """Process-wide pooled client for the n8n webhooks."""
+    return WebhookClient(metrics=get_metrics())
+
+@st.cache_resource
+def get_fetch_executor():
+    """Process-wide thread pool shared by every session for data fetches."""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="charlie-fetch")
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key runs the function; callers that arrive while it
+    is still running wait on the same Future and share its result - for at
+    most `timeout` seconds after the call started, if given, then they get
+    FuturesTimeoutError. Per-key counters record upstream calls made and
+    calls avoided.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, timeout=None):
+        with self._lock:
+            counts = self._counts.setdefault(key, {'calls': 0, 'shared': 0})
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                future = Future()
+                self._inflight[key] = (future, time.monotonic())
+                counts['calls'] += 1
+            else:
+                future, started = inflight
+                counts['shared'] += 1
+        
+        if not leader:
+            return future.result(None if timeout is None else max(0.0, started + timeout - time.monotonic()))
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return result
+
+    def stats(self):
+        """Return {key: {'calls': made, 'shared': avoided}} for every key seen."""
+        with self._lock:
+            return {key: dict(counts) for key, counts in self._counts.items()}
+
+def payload_version(payload):
+    """Version identifier of a payload: a short hash of its content."""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+class Snapshot:
+    """One fetched payload of a data source (or the error that replaced it).
+
+    version identifies the payload's content, so anything derived from it
+    (like rendered HTML) can be cached per version and shared across sessions.
+    A snapshot can hold both a payload and an error: the last good payload,
+    kept while upstream fails, with stale_since set to the first failure.
+    """
+
+    __slots__ = ('payload', 'fetched_at', 'error', 'version', 'checked_at', 'stale_since', 'restored')
+
+    def __init__(self, payload, fetched_at, error=None, version=None,
+                 checked_at=None, stale_since=None, restored=False):
+        self.payload = payload
+        self.fetched_at = fetched_at
+        self.error = error
+        if version is None and payload is not None:
+            version = payload_version(payload)
+        self.version = version
+        self.checked_at = fetched_at if checked_at is None else checked_at
+        self.stale_since = stale_since
+        self.restored = restored
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def failed(self, error, now):
+        """Return this payload marked stale after a failed refresh at `now`."""
+        return Snapshot(
+            self.payload, self.fetched_at, error=error, version=self.version,
+            checked_at=now, stale_since=self.stale_since or now,
+        )
+
+class SnapshotStore:
+    """SQLite file holding the last good payload of every data source.
+
+    Writes are skipped when a payload's version is unchanged (only its fetch
+    time is bumped). Disk errors are swallowed: the store is a fallback, never
+    a reason for a fetch to fail.
+    """
+
+    def __init__(self, path=SNAPSHOT_DB):
+        self.path = path
+        self._versions = {}
+        self._lock = threading.Lock()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS snapshots ("
+                    "name TEXT PRIMARY KEY, version TEXT, fetched_at REAL, payload TEXT)"
+                )
+        except sqlite3.Error:
+            pass
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def load(self):
+        """Return {name: Snapshot} for every stored source."""
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute("SELECT name, version, fetched_at, payload FROM snapshots").fetchall()
+        except sqlite3.Error:
+            return {}
+        
+        snapshots = {}
+        for name, version, fetched_at, payload in rows:
+            self._versions[name] = version
+            snapshots[name] = Snapshot(json.loads(payload), fetched_at, version=version, restored=True)
+        return snapshots
+
+    def save(self, name, snapshot):
+        """Persist a good snapshot of a source."""
+        try:
+            with self._lock, self._connect() as conn:
+                if self._versions.get(name) == snapshot.version:
+                    conn.execute("UPDATE snapshots SET fetched_at = ? WHERE name = ?",
+                                 (snapshot.fetched_at, name))
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                        (name, snapshot.version, snapshot.fetched_at, json.dumps(snapshot.payload)),
+                    )
+                    self._versions[name] = snapshot.version
+        except (sqlite3.Error, TypeError, ValueError):
+            pass
+
+class SnapshotCache:
+    """Stale-while-revalidate cache of data source snapshots, shared process-wide.
+
+    A snapshot younger than its soft TTL is served as-is. Between the soft and
+    hard TTL it is still served immediately while a single background refresh
+    runs. Only a missing snapshot, or one past its hard TTL, makes the caller
+    wait for the network. Failed fetches are remembered for the soft TTL so a
+    down upstream isn't retried on every rerun.
+    
+    With a store, every good payload is persisted and the stored snapshots
+    seed the cache at startup: they are served at once while a background
+    refresh runs. When upstream fails, the last good payload keeps being
+    served, marked with the time it went stale. on_update(name, snapshot) is
+    called after every good fetch. Fetch durations and failures are reported
+    to metrics when given; hits (served without waiting) and misses (waited
+    for the network) are counted like an LRUCache's.
+    """
+
+    def __init__(self, client, executor, config=SOURCE_CONFIG, store=None, on_update=None, metrics=None):
+        self._client = client
+        self._executor = executor
+        self.flight = SingleFlight()
+        self._config = config
+        self._store = store
+        self._on_update = on_update
+        self._metrics = metrics
+        self.hits = 0
+        self.misses = 0
+        self._entries = store.load() if store else {}
+        self._refreshing = set()
+        self._last_refresh = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, name, on_section=None):
+        """Fetch a source from upstream and store the resulting snapshot.
+
+        With on_section, the response is streamed and each top-level section
+        is normalized and passed to on_section((key, value)) as it arrives;
+        the top-level scalars (lastUpdated...) get their twins after the last.
+        """
+        now = time.time()
+        config = self._config[name]
+        started = time.perf_counter()
+        with self._lock:
+            previous = self._entries.get(name)
+        try:
+            if on_section is None:
+                payload = self._client.get_json(config['url'], delta=config.get('delta', False))
+            else:
+                payload = self._client.get_json(
+                    config['url'], delta=config.get('delta', False),
+                    on_section=lambda key, value: on_section((key, normalize_timestamps(value))),
+                )
+        except Exception as e:
+            if self._metrics:
+                self._metrics.count(f"fetch.{name}.errors")
+            with self._lock:
+                previous = self._entries.get(name)
+                # A failed refresh keeps serving the last good payload, marked stale
+                if previous is not None and previous.payload is not None:
+                    snapshot = previous.failed(e, now)
+                else:
+                    snapshot = Snapshot(None, now, error=e)
+                self._entries[name] = snapshot
+            return snapshot
+        
+        if self._metrics:
+            self._metrics.observe(f"fetch.{name}", time.perf_counter() - started)
+        if previous is not None and payload is previous.payload:
+            # Not modified: the client handed back the payload we hold, already
+            # normalized and versioned
+            snapshot = Snapshot(payload, now, version=previous.version)
+        else:
+            if on_section is None:
+                normalize_timestamps(payload)
+            else:
+                normalize_fields(payload)  # The sections were normalized as they arrived
+            # Upstream's version of the payload saves hashing it, when it sends one
+            snapshot = Snapshot(payload, now, version=self._client.version(config['url']))
+        with self._lock:
+            self._entries[name] = snapshot
+        if self._store:
+            self._store.save(name, snapshot)
+        if self._on_update:
+            self._on_update(name, snapshot)
+        return snapshot
+
+    def _load(self, name):
+        """Fetch a source, joining a fetch of it that is already in flight.
+
+        A joined fetch is waited on until FETCH_DEADLINE seconds after it
+        started (the deadline main() prefetched it under); past that the
+        caller gets the partial result of _timed_out() instead.
+        """
+        try:
+            return self.flight.do(name, self._fetch, name, timeout=FETCH_DEADLINE)
+        except FuturesTimeoutError:
+            return self._timed_out(name)
+
+    def _timed_out(self, name):
+        """Snapshot for a source whose fetch is still running past the deadline.
+
+        The last payload is kept, marked stale, when there is one. The fetch
+        itself carries on and replaces this snapshot when it lands.
+        """
+        now = time.time()
+        error = TimeoutError(f"{name} still loading after {FETCH_DEADLINE}s")
+        with self._lock:
+            previous = self._entries.get(name)
+            if previous is not None and previous.error is None and previous.checked_at > now - FETCH_DEADLINE:
+                return previous    # the fetch landed just as the wait gave up
+            if previous is not None and previous.payload is not None:
+                snapshot = previous.failed(error, now)
+            else:
+                snapshot = Snapshot(None, now, error=error)
+            self._entries[name] = snapshot
+        return snapshot
+
+    def _background_load(self, name):
+        try:
+            self._load(name)
+        finally:
+            with self._lock:
+                self._refreshing.discard(name)
+
+    def _refresh_in_background(self, name):
+        with self._lock:
+            if name in self._refreshing:
+                return
+            self._refreshing.add(name)
+        self._executor.submit(self._background_load, name)
+
+    def get(self, name):
+        """Return the snapshot for a source, fetching or refreshing as needed."""
+        config = self._config[name]
+        with self._lock:
+            snapshot = self._entries.get(name)
+        
+        if snapshot is None:
+            return self._miss(name)
+        if time.time() - snapshot.checked_at >= config['soft_ttl']:
+            # Stored and stale payloads are served as-is; only an expired
+            # live payload or a bare error makes the caller wait
+            expired = snapshot.age >= config['hard_ttl'] and not (snapshot.restored or snapshot.stale_since)
+            if snapshot.payload is None or expired:
+                return self._miss(name)
+            self._refresh_in_background(name)
+        with self._lock:
+            self.hits += 1
+        return snapshot
+
+    def _miss(self, name):
+        with self._lock:
+            self.misses += 1
+        return self._load(name)
+
+    def stream(self, name):
+        """Fetch a source, yielding (key, value) sections of its payload as they arrive.
+
+        Used on a cold start, when there is no snapshot to serve yet. If the
+        source is already being fetched, this waits for that fetch instead and
+        yields its sections at the end. Returns the final snapshot.
+        """
+        with self._lock:
+            self.misses += 1
+        sections = queue.Queue()
+        
+        def load():
+            try:
+                return self.flight.do(name, self._fetch, name, sections.put, timeout=FETCH_DEADLINE)
+            except FuturesTimeoutError:
+                return self._timed_out(name)
+            finally:
+                sections.put(None)
+        
+        future = self._executor.submit(load)
+        seen = set()
+        while (section := sections.get()) is not None:
+            seen.add(section[0])
+            yield section
+        snapshot = future.result()
+        # Sections not streamed to us (a 304, or a fetch we joined)
+        for key, value in (snapshot.payload or {}).items():
+            if key not in seen:
+                yield key, value
+        return snapshot
+
+    def peek(self, name):
+        """Return the cached snapshot for a source without fetching."""
+        with self._lock:
+            return self._entries.get(name)
+
+    def refresh(self, name, min_interval=REFRESH_MIN_INTERVAL):
+        """Force a fresh fetch of one source, rate-limited across all sessions.
+
+        Returns False without touching upstream if the source was refreshed
+        within min_interval; otherwise waits for one fetch (joining any already
+        in flight) and returns True. Other sources are left alone.
+        """
+        with self._lock:
+            if time.time() - self._last_refresh.get(name, 0) < min_interval:
+                return False
+            self._last_refresh[name] = time.time()
+        self._load(name)
+        return True
+
+@st.cache_resource
+def get_snapshot_cache():
+    """Process-wide stale-while-revalidate cache for every data source."""
+    return SnapshotCache(
+        get_http_client(), get_fetch_executor(),
+        store=SnapshotStore(), on_update=get_metrics_recorder().observe, metrics=get_metrics(),
+    )
+
+def fetch_snapshot(name):
+    """Return the current Snapshot of a source (payload plus its version)."""
+    return get_snapshot_cache().get(name)
+
+@timed
 def fetch_tasks():
-    """Fetch tasks data from n8n API."""
-    try:
-        response = requests.get(TASKS_API, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        st.error(f"Failed to fetch tasks: {e}")
-        return None
+    """Fetch tasks data from n8n API (None on failure, see fetch_error)."""
+    return fetch_snapshot("tasks").payload
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+@timed
 def fetch_youtube():
     """Fetch YouTube data from n8n API."""
+    return fetch_snapshot("youtube").payload  # YouTube data is optional (None on failure)
+
+# Maximum number of upstream list pages kept in memory
+PAGE_CACHE_SIZE = 64
+
+@st.cache_resource
+def get_page_cache():
+    """Process-wide cache of older list pages fetched through upstream cursors."""
+    return LRUCache(PAGE_CACHE_SIZE)
+
+def _load_list_page(list_key, cursor):
+    url = f"{TASKS_API}?{urlencode({'list': list_key, 'cursor': cursor})}"
+    page = normalize_timestamps(get_http_client().get_json(url))
+    items = tuple(ActivityEntry(item) for item in page.get('items', []))
+    return items, page.get('nextCursor')
+
+@timed
+def fetch_list_page(list_key, cursor):
+    """Fetch the next page of a tasks-payload list from upstream.
+
+    Where the tasks webhook supports paging, the payload carries a cursor per
+    list (payload['cursors'][list_key]) pointing past its last row, and
+    TASKS_API?list=<key>&cursor=<token> returns {"items": [...],
+    "nextCursor": ...}. Returns (items, next_cursor); pages are shared by
+    every session and concurrent requests for one page are coalesced.
+    """
+    return get_page_cache().get_or_set(
+        (list_key, cursor),
+        lambda: get_snapshot_cache().flight.do(("page", list_key, cursor), _load_list_page, list_key, cursor),
+    )
+
+def fetch_error(name):
+    """Return the error from the last failed fetch of a source, if any."""
+    snapshot = get_snapshot_cache().peek(name)
+    return snapshot.error if snapshot else None
+
+# Data sources fetched concurrently by main(), keyed by name
+DATA_SOURCES = {
+    "tasks": fetch_tasks,
+    "youtube": fetch_youtube,
+}
+
+def _run_in_script_ctx(ctx, fetch_fn):
+    """Run a fetch function in a worker thread attached to the caller's script run.
+
+    The script run context lets Streamlit calls made while fetching (such as
+    cache lookups) resolve against the caller's session. The pooled thread
+    gets its previous context (normally none) back afterwards, so later jobs
+    never run against a finished - or another session's - script run.
+    """
+    thread = threading.current_thread()
+    previous = get_script_run_ctx(suppress_warning=True)
+    add_script_run_ctx(thread, ctx)
+    try:
+        return fetch_fn()
+    finally:
+        if previous is not None:
+            add_script_run_ctx(thread, previous)
+        else:
+            # add_script_run_ctx() can't detach: drop the attribute it set
+            vars(thread).pop(SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+
+def iter_sources(names=None, deadline=FETCH_DEADLINE):
+    """Fetch data sources concurrently, yielding (name, payload) as each finishes.
+
+    All requests are issued at once. Sources still running when the overall
+    deadline passes are skipped, and sources that raise yield None.
+    """
+    names = list(names or DATA_SOURCES)
+    ctx = get_script_run_ctx()
+    executor = get_fetch_executor()
+    futures = {
+        executor.submit(_run_in_script_ctx, ctx, DATA_SOURCES[name]): name
+        for name in names
+    }
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            try:
+                yield futures[future], future.result()
+            except Exception:
+                yield futures[future], None
+    except FuturesTimeoutError:
+        return
+
+@timed
+def fetch_all(names=None, deadline=FETCH_DEADLINE):
+    """Fetch data sources concurrently and return a dict of name -> payload.
+
+    Sources that fail or miss the deadline map to None (partial results).
+    """
+    results = dict.fromkeys(names or DATA_SOURCES)
+    results.update(iter_sources(names, deadline))
+    return results
+
+# =============================================================================
+# TIMESTAMPS
+# =============================================================================
+# ISO timestamps are parsed once, when a payload arrives: every field named in
+# TIMESTAMP_FIELDS gets an epoch-seconds twin ('time' -> 'timeEpoch'), so
+# rendering only does arithmetic against a single "now".
+
+# Payload fields holding ISO-8601 timestamps
+TIMESTAMP_FIELDS = ('time', 'publishedAt', 'lastUpdated', 'charlieLastActive', 'due')
+
+# Timezone for timestamps without an offset (e.g. date-only due dates)
+LOCAL_TZ = pytz.timezone('Australia/Perth')
+
+@functools.lru_cache(maxsize=65536)
+def parse_timestamp(iso_string):
+    """Parse an ISO-8601 string to epoch seconds (None if unparseable).
+
+    Memoized, since payloads repeat the same timestamps across rows and fetches.
+    """
+    if not iso_string or not isinstance(iso_string, str):
+        return None
     try:
-        response = requests.get(YOUTUBE_API, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        return None  # YouTube data is optional
+        dt = datetime.fromisoformat(iso_string.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = LOCAL_TZ.localize(dt)
+    return dt.timestamp()
+
+def normalize_fields(item):
+    """Add the epoch twins of one dict's own timestamp fields, in place (not nested ones)."""
+    for field in TIMESTAMP_FIELDS:
+        if isinstance(item.get(field), str):
+            item[field + 'Epoch'] = parse_timestamp(item[field])
+    return item
+
+def normalize_timestamps(node):
+    """Add an epoch-seconds '<field>Epoch' next to every timestamp field, in place."""
+    if isinstance(node, dict):
+        normalize_fields(node)
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                normalize_timestamps(value)
+    elif isinstance(node, list):
+        for item in node:
+            normalize_timestamps(item)
+    return node
+
+def item_time(item, field):
+    """Return a timestamp field as epoch seconds (None if missing or invalid).
+
+    Uses the value normalized at ingest, parsing only items that weren't
+    (such as the built-in fallback data).
+    """
+    epoch = item.get(field + 'Epoch')
+    return epoch if epoch is not None else parse_timestamp(item.get(field))
+
+def render_clock():
+    """The "now" (epoch seconds) relative time labels are computed from.
+
+    Aligned to the minute, so every label in a rerun agrees, and sections
+    shared through the per-minute render cache are identical for everyone.
+    """
+    return (time.time() // 60) * 60
+
+# =============================================================================
+# DATA MODEL
+# =============================================================================
+# Payload items are converted once per snapshot into immutable slotted records
+# shared read-only by every session. Fields are named after the payload keys
+# and read with model.get(...) like the dicts they replace, so renderers take
+# models and plain dicts (fallback data, streamed sections) alike.
+
+class Model:
+    """Immutable record of one payload item.
+
+    Uses __slots__ instead of a per-item dict. Its content digest, which
+    keys the rendered-card cache, is computed on first use and kept.
+    """
+
+    __slots__ = ('_digest',)
+    FIELDS = ()
+
+    def __init__(self, item):
+        for field in self.FIELDS:
+            object.__setattr__(self, field, item.get(field))
+
+    @property
+    def digest(self):
+        try:
+            return self._digest
+        except AttributeError:
+            digest = item_hash({field: getattr(self, field) for field in self.FIELDS})
+            object.__setattr__(self, '_digest', digest)
+            return digest
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    def get(self, field, default=None):
+        """Dict-style read: the field's value, or default if missing/None."""
+        value = getattr(self, field, None) if field in self.FIELDS else None
+        return default if value is None else value
+
+class Task(Model):
+    __slots__ = FIELDS = ('title', 'status', 'priority', 'due', 'dueEpoch')
+
+class ActivityEntry(Model):
+    __slots__ = FIELDS = ('action', 'time', 'timeEpoch')
+
+class Reminder(Model):
+    __slots__ = FIELDS = ('schedule', 'text')
+
+class Session(Model):
+    __slots__ = FIELDS = ('type', 'name', 'tokens')
+
+class Video(Model):
+    __slots__ = FIELDS = ('id', 'videoId', 'title', 'views', 'likes', 'comments', 'publishedAt', 'publishedAtEpoch')
+
+class ChannelStats(Model):
+    __slots__ = FIELDS = ('subscribers', 'totalViews', 'videoCount', 'views30d')
+
+# Payload sections converted to models, per source: list sections become
+# tuples of models, dict sections a single model
+MODEL_SECTIONS = {
+    "tasks": {
+        "forBrooke": Task,
+        "forCharlie": Task,
+        "activity": ActivityEntry,
+        "workLog": ActivityEntry,
+        "reminders": Reminder,
+        "sessions": Session,
+    },
+    "youtube": {
+        "channel": ChannelStats,
+        "topVideos": Video,
+        "recentVideos": Video,
+    },
+}
+
+def build_models(name, payload):
+    """Shallow copy of a payload with its model sections converted to models."""
+    models = dict(payload)
+    for key, model in MODEL_SECTIONS[name].items():
+        value = payload.get(key)
+        if isinstance(value, list):
+            models[key] = tuple(model(item) for item in value if isinstance(item, dict))
+        elif isinstance(value, dict):
+            models[key] = model(value)
+    return models
+
+def get_models(name, snapshot):
+    """Return the models of a snapshot's payload, built once per version."""
+    if snapshot.version is None:
+        return build_models(name, snapshot.payload)
+    return get_index_cache().get_or_set(
+        ("models", name, snapshot.version), lambda: build_models(name, snapshot.payload)
+    )
+
+# =============================================================================
+# TASK INDEX
+# =============================================================================
+
+# Task lists in the tasks payload, keyed by owner
+TASK_OWNERS = ('forBrooke', 'forCharlie')
+
+# Window for the "due soon" count in the stats bar (days)
+DUE_SOON_DAYS = 7
+
+class TaskIndex:
+    """Index over a tasks snapshot, built in a single pass over every task.
+
+    Holds each owner's open tasks, the done count, and the due dates of open
+    tasks as a sorted list, so overdue and due-soon queries are a binary
+    search. Due dates are epoch seconds, so comparisons are
+    timezone-correct.
+
+    TaskTable answers the same queries: done, active_count(), active_tasks(),
+    overdue() and due_within().
+    """
+
+    def __init__(self, payload):
+        self._active = {owner: [] for owner in TASK_OWNERS}
+        self.done = 0
+        due_dates = []
+        
+        for owner in TASK_OWNERS:
+            for task in (payload or {}).get(owner, []):
+                if task.get('status', 'pending') == 'done':
+                    self.done += 1
+                    continue
+                self._active[owner].append(task)
+                due = item_time(task, 'due')
+                if due is not None:
+                    due_dates.append(due)
+        
+        due_dates.sort()
+        self._due_dates = due_dates
+
+    def active_count(self, owner):
+        """Number of open tasks for an owner."""
+        return len(self._active[owner])
+
+    def active_tasks(self, owner, limit=None):
+        """An owner's open tasks in payload order (the first `limit` of them)."""
+        return self._active[owner][:limit]
+
+    def overdue(self, now=None):
+        """Number of open tasks whose due date has passed."""
+        now = time.time() if now is None else now
+        return bisect.bisect_left(self._due_dates, now)
+
+    def due_within(self, days, now=None):
+        """Number of open tasks due in the next `days` days (not yet overdue)."""
+        now = time.time() if now is None else now
+        return (bisect.bisect_right(self._due_dates, now + days * 86400)
+                - bisect.bisect_left(self._due_dates, now))
+
+class TaskTable:
+    """Columnar (NumPy) task index with the same queries as TaskIndex.
+
+    Owner and status are int8 code arrays and due dates a float64 epoch array
+    (NaN when missing); counts and due queries are vectorized masks and a
+    searchsorted over sorted open due dates. Rows stay the payload's dicts.
+    Used from TASK_TABLE_MIN_ROWS tasks (see build_task_index).
+    """
+
+    DONE = 2
+    STATUS_CODES = {'pending': 0, 'in-progress': 1, 'done': DONE}
+
+    def __init__(self, payload):
+        self.rows = []
+        owners = []
+        for code, owner in enumerate(TASK_OWNERS):
+            tasks = (payload or {}).get(owner, [])
+            self.rows.extend(tasks)
+            owners.extend([code] * len(tasks))
+        
+        self.owner = np.array(owners, dtype=np.int8)
+        self.status = np.array(
+            [self.STATUS_CODES.get(t.get('status', 'pending'), 0) for t in self.rows], dtype=np.int8
+        )
+        self.due = np.array(
+            [np.nan if (due := item_time(t, 'due')) is None else due for t in self.rows], dtype=np.float64
+        )
+        
+        open_mask = self.status != self.DONE
+        self._active = {
+            owner: np.flatnonzero(open_mask & (self.owner == code))
+            for code, owner in enumerate(TASK_OWNERS)
+        }
+        self._due_dates = np.sort(self.due[open_mask & ~np.isnan(self.due)])
+        self.done = int(np.count_nonzero(~open_mask))
+
+    def active_count(self, owner):
+        return len(self._active[owner])
+
+    def active_tasks(self, owner, limit=None):
+        return [self.rows[i] for i in self._active[owner][:limit]]
+
+    def overdue(self, now=None):
+        now = time.time() if now is None else now
+        return int(np.searchsorted(self._due_dates, now, side='left'))
+
+    def due_within(self, days, now=None):
+        now = time.time() if now is None else now
+        start = np.searchsorted(self._due_dates, now, side='left')
+        end = np.searchsorted(self._due_dates, now + days * 86400, side='right')
+        return int(end - start)
+
+class VideoTable:
+    """Columnar (NumPy) view of a video list: views/likes/comments and publish time."""
+
+    def __init__(self, videos):
+        self.rows = list(videos)
+        self.columns = {
+            field: np.array([v.get(field) or 0 for v in self.rows], dtype=np.int64)
+            for field in ('views', 'likes', 'comments')
+        }
+        self.columns['publishedAt'] = np.array(
+            [np.nan if (ts := item_time(v, 'publishedAt')) is None else ts for v in self.rows],
+            dtype=np.float64,
+        )
+
+    def top(self, field, n):
+        """The n videos with the largest value in a column (missing values last)."""
+        values = -self.columns[field]
+        order = np.arange(len(values))
+        if n < len(values):
+            # Partial selection of the n best, then only those are sorted
+            order = np.sort(np.argpartition(values, n)[:n])
+        order = order[np.argsort(values[order], kind='stable')][:n]
+        return [self.rows[i] for i in order]
+
+# Video lists at least this long are ranked from a cached VideoTable: its
+# build costs about two direct rankings (benchmarks/columnar.py)
+VIDEO_TABLE_MIN_ROWS = 1000
+
+# Task payloads at least this long get the columnar TaskTable. None: TaskIndex
+# both builds and queries faster at every size measured (up to 300k rows)
+TASK_TABLE_MIN_ROWS = None
+
+def build_task_index(payload):
+    """Build the index for a tasks payload (a TaskTable from TASK_TABLE_MIN_ROWS tasks)."""
+    if TASK_TABLE_MIN_ROWS is not None:
+        total = sum(len((payload or {}).get(owner, [])) for owner in TASK_OWNERS)
+        if total >= TASK_TABLE_MIN_ROWS:
+            return TaskTable(payload)
+    return TaskIndex(payload)
+
+def rank_videos(videos, field, n, name=None, version=None):
+    """Return the n videos with the largest `field` ('views', 'publishedAt', ...).
+
+    Large lists from a versioned snapshot (name is the payload key, e.g.
+    'topVideos') use a cached VideoTable and argsort; short ones are ranked
+    directly.
+    """
+    if version is not None and len(videos) >= VIDEO_TABLE_MIN_ROWS:
+        table = get_index_cache().get_or_set(
+            ("videos", name, version), lambda: VideoTable(videos)
+        )
+        return table.top(field, n)
+    if field == 'publishedAt':
+        return heapq.nlargest(n, videos, key=lambda v: item_time(v, field) or 0)
+    return heapq.nlargest(n, videos, key=lambda v: v.get(field) or 0)
+
+# Maximum number of per-snapshot indexes kept in memory
+INDEX_CACHE_SIZE = 16
+
+@st.cache_resource
+def get_index_cache():
+    """Process-wide cache of per-snapshot indexes, keyed by snapshot version."""
+    return LRUCache(INDEX_CACHE_SIZE)
+
+def get_task_index(snapshot):
+    """Return the TaskIndex of a tasks snapshot (over its models), built once per version."""
+    if snapshot.version is None:
+        return build_task_index(get_models("tasks", snapshot))
+    return get_index_cache().get_or_set(
+        ("tasks", snapshot.version), lambda: build_task_index(get_models("tasks", snapshot))
+    )
+
+# =============================================================================
+# METRICS HISTORY
+# =============================================================================
+# Every YouTube snapshot is folded into compact per-metric time series (channel
+# subscribers/totalViews/views30d, per-video views/likes/comments), so trend
+# charts are answered locally instead of from repeated upstream calls.
+
+# Channel-level and per-video metrics recorded from each YouTube snapshot
+CHANNEL_METRICS = ('subscribers', 'totalViews', 'views30d')
+VIDEO_METRICS = ('views', 'likes', 'comments')
+
+# Downsampled rollup resolutions (bucket width in seconds). Weeks start on
+# Monday (the epoch fell on a Thursday, hence the 4-day origin).
+ROLLUPS = {
+    "hour": (3600, 0),
+    "day": (86400, 0),
+    "week": (7 * 86400, 4 * 86400),
+}
+
+# Seconds of history the metrics store keeps: the longest trend range (1y)
+# plus one week bucket, so its oldest rollup point is still complete
+METRICS_RETENTION = 365 * 86400 + 7 * 86400
+
+class MetricSeries:
+    """Append-only integer time series stored as delta-encoded array columns.
+
+    Times and values are kept as differences from the previous point in
+    int64 arrays (8 bytes each, no per-point objects). With a bucket width,
+    points falling in the current bucket replace its value instead of adding
+    a point, which is how the hour/day/week rollups keep the last value seen
+    in each bucket. Decoded columns are cached until the next append.
+    """
+
+    __slots__ = ('step', 'origin', '_dt', '_dv', '_last_t', '_last_v', '_decoded')
+
+    def __init__(self, step=None, origin=0):
+        self.step = step
+        self.origin = origin
+        self._dt = array('q')
+        self._dv = array('q')
+        self._last_t = None
+        self._last_v = 0
+        self._decoded = None
+
+    def __len__(self):
+        return len(self._dt)
+
+    @property
+    def last(self):
+        """Most recent value (None if empty)."""
+        return self._last_v if self._dt else None
+
+    def append(self, t, value):
+        """Add a point at epoch second t; out-of-order points are ignored."""
+        t = int(t)
+        value = int(value)
+        if self.step:
+            t -= (t - self.origin) % self.step
+        if self._last_t is not None and t < self._last_t:
+            return
+        if t == self._last_t:
+            self._dv[-1] += value - self._last_v
+        else:
+            self._dt.append(t - (self._last_t or 0))
+            self._dv.append(value - self._last_v)
+            self._last_t = t
+        self._last_v = value
+        self._decoded = None
+
+    def points(self):
+        """Decoded (times, values) int64 arrays."""
+        if self._decoded is None:
+            self._decoded = (
+                np.cumsum(np.frombuffer(self._dt, dtype=np.int64)),
+                np.cumsum(np.frombuffer(self._dv, dtype=np.int64)),
+            )
+        return self._decoded
+
+    def range(self, start=None, end=None):
+        """(times, values) of the series as a step function over start <= t < end.
+
+        Only changes are stored, so the value in effect at start (the last
+        point before it) is carried in as a point at start, and with an end
+        the value in effect then is carried out to a point at end: a metric
+        that stayed flat still spans the whole range.
+        """
+        times, values = self.points()
+        i = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        j = len(times) if end is None else int(np.searchsorted(times, end, side='left'))
+        head_t, head_v, tail_t, tail_v = [], [], [], []
+        if i > 0 and i <= j and (i == j or times[i] > start):
+            head_t, head_v = [int(start)], [values[i - 1]]
+        if end is not None and (i < j or head_t):
+            tail_t, tail_v = [int(end)], [values[j - 1]]
+        if not head_t and not tail_t:
+            return times[i:j], values[i:j]
+        return (
+            np.concatenate((np.array(head_t, dtype=np.int64), times[i:j], np.array(tail_t, dtype=np.int64))),
+            np.concatenate((np.array(head_v, dtype=np.int64), values[i:j], np.array(tail_v, dtype=np.int64))),
+        )
+
+    @property
+    def nbytes(self):
+        return self._dt.itemsize * (len(self._dt) + len(self._dv))
+
+class MetricHistory:
+    """Raw series plus hour/day/week rollups of one metric."""
+
+    __slots__ = ('raw', 'rollups')
+
+    def __init__(self):
+        self.raw = MetricSeries()
+        self.rollups = {name: MetricSeries(step, origin) for name, (step, origin) in ROLLUPS.items()}
+
+    def append(self, t, value):
+        """Record a value; returns False when it is unchanged and was skipped."""
+        if self.raw.last == value:
+            return False  # Metrics are step functions: only changes are stored
+        self.raw.append(t, value)
+        for series in self.rollups.values():
+            series.append(t, value)
+        return True
+
+    def range(self, start=None, end=None, resolution="raw"):
+        series = self.raw if resolution == "raw" else self.rollups[resolution]
+        return series.range(start, end)
+
+    @property
+    def nbytes(self):
+        return self.raw.nbytes + sum(s.nbytes for s in self.rollups.values())
+
+def video_key(video):
+    """Stable series key of a video (its id, falling back to its title)."""
+    return video.get('id') or video.get('videoId') or video.get('title', '')
+
+class MetricsStore:
+    """SQLite log of metric changes, compacted and replayed into memory at startup."""
+
+    def __init__(self, path=SNAPSHOT_DB, retention=METRICS_RETENTION):
+        self.path = path
+        self.retention = retention
+        try:
+            with sqlite3.connect(self.path, timeout=5) as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS metric_samples (series TEXT, t INTEGER, value INTEGER)")
+        except sqlite3.Error:
+            pass
+
+    def compact(self, now=None):
+        """Drop rows older than the retention window.
+
+        Each series keeps its last row before the cutoff, so a metric that
+        hasn't changed since then still has its current value.
+        """
+        cutoff = int((time.time() if now is None else now) - self.retention)
+        try:
+            with sqlite3.connect(self.path, timeout=5) as conn:
+                conn.execute(
+                    "DELETE FROM metric_samples WHERE t < ? AND rowid NOT IN "
+                    "(SELECT MAX(rowid) FROM metric_samples WHERE t < ? GROUP BY series)",
+                    (cutoff, cutoff),
+                )
+        except sqlite3.Error:
+            pass
+
+    def load(self):
+        """Every stored (series, t, value) row in time order, compacting first."""
+        self.compact()
+        try:
+            with sqlite3.connect(self.path, timeout=5) as conn:
+                return conn.execute("SELECT series, t, value FROM metric_samples ORDER BY t, rowid").fetchall()
+        except sqlite3.Error:
+            return []
+
+    def append(self, rows):
+        try:
+            with sqlite3.connect(self.path, timeout=5) as conn:
+                conn.executemany("INSERT INTO metric_samples VALUES (?, ?, ?)", rows)
+        except sqlite3.Error:
+            pass
+
+class MetricsRecorder:
+    """Process-wide time-series store of YouTube channel and video metrics.
+
+    Series are keyed "channel.<metric>" and "video.<key>.<metric>". Only
+    changed values are appended (in memory and to the store), so an
+    unchanged snapshot costs nothing.
+    """
+
+    def __init__(self, store=None):
+        self._store = store
+        self._series = {}
+        self._lock = threading.Lock()
+        for key, t, value in (store.load() if store else []):
+            self._history(key).append(t, value)
+
+    def _history(self, key):
+        history = self._series.get(key)
+        if history is None:
+            history = self._series[key] = MetricHistory()
+        return history
+
+    def record(self, payload, t):
+        """Fold one YouTube payload, fetched at epoch second t, into the series."""
+        samples = [
+            (f"channel.{metric}", value)
+            for metric in CHANNEL_METRICS
+            if isinstance(value := (payload.get('channel') or {}).get(metric), (int, float))
+        ]
+        seen = set()
+        for video in (payload.get('topVideos') or []) + (payload.get('recentVideos') or []):
+            key = video_key(video)
+            if key in seen:
+                continue
+            seen.add(key)
+            samples.extend(
+                (f"video.{key}.{metric}", value)
+                for metric in VIDEO_METRICS
+                if isinstance(value := video.get(metric), (int, float))
+            )
+        
+        t = int(t)
+        with self._lock:
+            changed = [(key, t, int(value)) for key, value in samples if self._history(key).append(t, value)]
+        if changed and self._store:
+            self._store.append(changed)
+
+    def observe(self, name, snapshot):
+        """SnapshotCache hook: record every fresh YouTube snapshot."""
+        if name == "youtube" and snapshot.payload:
+            self.record(snapshot.payload, snapshot.fetched_at)
+
+    def query(self, key, start=None, end=None, resolution="raw"):
+        """(times, values) of one series between start and end (epoch seconds, default now).
+
+        The values in effect at start and end are included as points there,
+        since only changes are recorded.
+        """
+        end = time.time() if end is None else end
+        with self._lock:
+            history = self._series.get(key)
+            if history is None:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+            return history.range(start, end, resolution)
+
+    def keys(self, prefix=""):
+        with self._lock:
+            return [key for key in self._series if key.startswith(prefix)]
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(history.nbytes for history in self._series.values())
+
+@st.cache_resource
+def get_metrics_recorder():
+    """Process-wide YouTube metrics history, restored from the snapshot store."""
+    return MetricsRecorder(MetricsStore())
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def format_time_ago(value, now=None):
+    """Format a timestamp (epoch seconds or ISO string) to relative time."""
+    timestamp = value if isinstance(value, (int, float)) else parse_timestamp(value)
+    if timestamp is None:
+        return ""
+    
+    diff = (render_clock() if now is None else now) - timestamp
+    minutes = int(diff / 60)
+    hours = int(diff / 3600)
+    days = int(diff / 86400)
+    
+    if minutes < 1:
+        return "Just now"
+    elif minutes < 60:
+        return f"{minutes}m ago"
+    elif hours < 24:
+        return f"{hours}h ago"
+    elif days < 7:
+        return f"{days}d ago"
+    else:
+        return format_day(int(timestamp // 86400))
+
+@functools.lru_cache(maxsize=4096)
+def format_day(day):
+    """Format a UTC day number (epoch seconds // 86400) as a short date (e.g. Jan 28)."""
+    return datetime.fromtimestamp(day * 86400, pytz.UTC).strftime("%b %d")
+
+def format_age(seconds):
+    """Format a duration in seconds as a compact age (e.g. 45s, 3m, 2h)."""
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m"
+    return f"{int(seconds // 3600)}h"
+
+def format_number(num):
+    """Format large numbers with K/M suffixes."""
+    if not num:
+        return "--"
+    if num >= 1000000:
+        return f"{num/1000000:.1f}M"
+    if num >= 1000:
+        return f"{num/1000:.1f}K"
+    return str(num)
+
+def get_charlie_status(data):
+    """Determine if Charlie is awake or sleeping."""
+    last_active = item_time(data, 'charlieLastActive') if data else None
+    return last_active is not None and time.time() - last_active < 300  # 5 minutes
+
+def get_workshop_countdown():
+    """Calculate countdown to workshop."""
+    now = datetime.now(pytz.timezone('Australia/Perth'))
+    time_to_workshop = WORKSHOP_DATE_1 - now
+    
+    if time_to_workshop.total_seconds() < 0:
+        time_to_workshop = WORKSHOP_DATE_2 - now
+    
+    days = time_to_workshop.days
+    hours = time_to_workshop.seconds // 3600
+    
+    return days, hours
+
+# =============================================================================
+# CARD TEMPLATES
+# =============================================================================
+# Card markup is compiled once per process into string.Template objects, and
+# rendered cards are memoized in a bounded LRU keyed by a hash of the item
+# dict, so an unchanged item costs a dictionary lookup on later reruns.
+
+CARD_TEMPLATES = {
+    "task": """
+        <div class="$card_class">
+            <div class="task-title">$priority_badge$title</div>
+            <div class="task-meta">
+                $status_emoji $status_label
+                $due
+            </div>
+        </div>
+    """,
+    "activity": """
+        <div class="activity-item">
+            <div>$action</div>
+            <div class="activity-time">$time_ago</div>
+        </div>
+    """,
+    "work_log": """
+        <div class="activity-item">
+            <div class="activity-time">$time_ago</div>
+            <div>$action</div>
+        </div>
+    """,
+    "top_video": """
+        <div class="video-item">
+            <div class="video-title">$title</div>
+            <div class="video-stats">
+                👁️ $views • 
+                👍 $likes • 
+                💬 $comments • 
+                📅 $time_ago
+            </div>
+        </div>
+    """,
+    "recent_video": """
+        <div class="video-item">
+            <div class="video-title">$title</div>
+            <div class="video-stats">
+                👁️ $views • 
+                📅 $time_ago
+            </div>
+        </div>
+    """,
+    "competitor": """
+        <div class="competitor-item">
+            <div>
+                <div class="competitor-name">$name</div>
+                <div class="competitor-handle">$handle</div>
+            </div>
+            <div style="text-align: right;">
+                <div class="competitor-subs">$subs</div>
+                <div style="font-size: 0.75rem; color: #888;">$style</div>
+            </div>
+        </div>
+    """,
+}
+
+def _task_card_fields(task):
+    status = task.get('status', 'pending')
+    priority = task.get('priority', 'normal')
+    
+    card_class = "task-card"
+    if status == 'done':
+        card_class += " done"
+    elif status == 'in-progress':
+        card_class += " in-progress"
+    elif priority == 'high':
+        card_class += " high"
+    
+    status_emoji = {
+        'done': '✅',
+        'in-progress': '🔄',
+        'pending': '⏳'
+    }.get(status, '⏳')
+    
+    return {
+        'card_class': card_class,
+        'priority_badge': "🔥 " if priority == 'high' else "",
+        'title': task.get('title', 'Untitled'),
+        'status_emoji': status_emoji,
+        'status_label': status.replace('-', ' ').title(),
+        'due': ' • Due: ' + task.get('due', '')[:10] if task.get('due') else '',
+    }
+
+def _log_item_fields(item):
+    return {'action': item.get('action', '')}
+
+def _video_fields(video):
+    return {
+        'title': video.get('title', ''),
+        'views': format_number(video.get('views', 0)),
+        'likes': format_number(video.get('likes', 0)),
+        'comments': format_number(video.get('comments', 0)),
+    }
+
+def _competitor_fields(competitor):
+    return {key: competitor[key] for key in ('name', 'handle', 'subs', 'style')}
+
+# Template name -> function extracting its substitution fields from an item
+CARD_FIELDS = {
+    "task": _task_card_fields,
+    "activity": _log_item_fields,
+    "work_log": _log_item_fields,
+    "top_video": _video_fields,
+    "recent_video": _video_fields,
+    "competitor": _competitor_fields,
+}
+
+# Maximum number of rendered cards kept in memory
+CARD_CACHE_SIZE = 2048
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, build):
+        """Return the cached value for key, building and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.set(key, value)
+        return value
+
+def item_hash(item):
+    """Stable content hash of an item dict (a model's memoized digest)."""
+    # Duck-typed: each rerun re-executes this module, so models cached by an
+    # earlier run are instances of that run's Model class, not this one's
+    digest = getattr(item, 'digest', None)
+    if digest is not None:
+        return digest
+    encoded = json.dumps(item, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+class CardRenderer:
+    """Compiled card templates plus a bounded LRU of rendered cards.
 
-# =============================================================================
-# HELPER FUNCTIONS
-# =============================================================================
+    Cards are keyed by template name, the item's content hash and any extra
+    per-render fields (such as a relative-time label), so changing an item or
+    its label renders it afresh while everything else is a cache hit.
+    """
 
-def format_time_ago(iso_string):
-    """Format ISO timestamp to relative time."""
-    if not iso_string:
-        return ""
-    try:
-        dt = datetime.fromisoformat(iso_string.replace('Z', '+00:00'))
-        now = datetime.now(pytz.UTC)
-        diff = now - dt
-        
-        minutes = int(diff.total_seconds() / 60)
-        hours = int(diff.total_seconds() / 3600)
-        days = int(diff.total_seconds() / 86400)
-        
-        if minutes < 1:
-            return "Just now"
-        elif minutes < 60:
-            return f"{minutes}m ago"
-        elif hours < 24:
-            return f"{hours}h ago"
-        elif days < 7:
-            return f"{days}d ago"
-        else:
-            return dt.strftime("%b %d")
-    except:
-        return ""
+    def __init__(self, templates=CARD_TEMPLATES, fields=CARD_FIELDS, maxsize=CARD_CACHE_SIZE):
+        self._templates = {
+            name: string.Template(textwrap.dedent(source).strip())
+            for name, source in templates.items()
+        }
+        self._fields = fields
+        self.cache = LRUCache(maxsize)
 
-def format_number(num):
-    """Format large numbers with K/M suffixes."""
-    if not num:
-        return "--"
-    if num >= 1000000:
-        return f"{num/1000000:.1f}M"
-    if num >= 1000:
-        return f"{num/1000:.1f}K"
-    return str(num)
+    def render(self, name, item, **extra):
+        """Return the HTML of one card, rendering it only on a cache miss."""
+        key = (name, item_hash(item), tuple(sorted(extra.items())))
+        return self.cache.get_or_set(
+            key, lambda: self._templates[name].substitute(self._fields[name](item), **extra)
+        )
 
-def get_charlie_status(data):
-    """Determine if Charlie is awake or sleeping."""
-    if not data or 'charlieLastActive' not in data:
-        return False
-    try:
-        last_active = datetime.fromisoformat(data['charlieLastActive'].replace('Z', '+00:00'))
-        now = datetime.now(pytz.UTC)
-        return (now - last_active).total_seconds() < 300  # 5 minutes
-    except:
-        return False
+@st.cache_resource
+def get_card_renderer():
+    """Process-wide card renderer shared by every session."""
+    return CardRenderer()
 
-def get_workshop_countdown():
-    """Calculate countdown to workshop."""
-    now = datetime.now(pytz.timezone('Australia/Perth'))
-    time_to_workshop = WORKSHOP_DATE_1 - now
-    
-    if time_to_workshop.total_seconds() < 0:
-        time_to_workshop = WORKSHOP_DATE_2 - now
-    
-    days = time_to_workshop.days
-    hours = time_to_workshop.seconds // 3600
-    
-    return days, hours
+# Maximum number of rendered sections kept in memory
+SECTION_CACHE_SIZE = 256
+
+@st.cache_resource
+def get_section_cache():
+    """Process-wide cache of rendered section HTML, keyed by snapshot version."""
+    return LRUCache(SECTION_CACHE_SIZE)
 
 # =============================================================================
 # UI COMPONENTS
 # =============================================================================
 
-def render_header(data):
-    """Render the dashboard header with Charlie status."""
+@st.fragment(run_every=LIVE_REFRESH['status'])
+@timed
+def render_header_status():
+    """Render Charlie's status and sync age; re-runs on its own interval."""
+    data = fetch_tasks()
     is_awake = get_charlie_status(data)
     
-    col1, col2, col3 = st.columns([3, 1, 1])
+    col1, col2 = st.columns([3, 1])
     
     with col1:
         status_icon = "⚡" if is_awake else "😴"
@@ -439,34 +2530,58 @@ def render_header(data):
         """, unsafe_allow_html=True)
     
     with col2:
+        sync_parts = []
         if data and 'lastUpdated' in data:
-            st.caption(f"Last sync: {format_time_ago(data['lastUpdated'])}")
-    
-    with col3:
-        if st.button("🔄 Refresh", use_container_width=True):
-            st.cache_data.clear()
-            st.rerun()
+            sync_parts.append(f"Last sync: {format_time_ago(item_time(data, 'lastUpdated'))}")
+        
+        # Age of the cached snapshot; ↻ means a background refresh is due
+        snapshot = get_snapshot_cache().peek("tasks")
+        if snapshot and snapshot.payload is not None:
+            stale = snapshot.age >= SOURCE_CONFIG['tasks']['soft_ttl']
+            sync_parts.append(f"{'↻ ' if stale else ''}data {format_age(snapshot.age)} old")
+        
+        if sync_parts:
+            st.caption(" · ".join(sync_parts))
 
-def render_stats_bar(data):
-    """Render the stats bar at the top."""
-    if not data:
+@timed
+def render_stale_notice(name):
+    """Warn when a source is being served from its last good payload."""
+    snapshot = get_snapshot_cache().peek(name)
+    if snapshot is None or snapshot.stale_since is None or snapshot.payload is None:
         return
     
-    brooke_active = len([t for t in data.get('forBrooke', []) if t.get('status') != 'done'])
-    charlie_active = len([t for t in data.get('forCharlie', []) if t.get('status') != 'done'])
-    all_done = len([t for t in data.get('forBrooke', []) + data.get('forCharlie', []) if t.get('status') == 'done'])
+    stale_since = datetime.fromtimestamp(snapshot.stale_since, LOCAL_TZ).strftime("%b %d %H:%M")
+    st.warning(
+        f"⚠️ {name.title()} upstream unavailable: showing saved data "
+        f"{format_age(snapshot.age)} old (stale since {stale_since})"
+    )
+
+@timed
+def render_header():
+    """Render the dashboard header with Charlie status."""
+    col1, col2 = st.columns([4, 1])
+    
+    with col1:
+        render_header_status()
     
-    # Count overdue
-    now = datetime.now()
-    overdue = 0
-    for task in data.get('forBrooke', []) + data.get('forCharlie', []):
-        if task.get('status') != 'done' and task.get('due'):
-            try:
-                due_date = datetime.fromisoformat(task['due'].replace('Z', '+00:00'))
-                if due_date.replace(tzinfo=None) < now:
-                    overdue += 1
-            except:
-                pass
+    with col2:
+        with st.popover("🔄 Refresh", use_container_width=True):
+            for name, label in (("tasks", "📋 Tasks"), ("youtube", "▶️ YouTube")):
+                if st.button(label, key=f"refresh_{name}", use_container_width=True):
+                    if get_snapshot_cache().refresh(name):
+                        st.rerun()
+                    st.toast(f"{label} refreshed moments ago - showing latest data")
+
+@timed
+def render_stats_bar(index):
+    """Render the stats bar at the top."""
+    brooke_active = index.active_count('forBrooke')
+    charlie_active = index.active_count('forCharlie')
+    all_done = index.done
+    
+    now = time.time()
+    overdue = index.overdue(now)
+    due_soon = index.due_within(DUE_SOON_DAYS, now)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -499,105 +2614,177 @@ def render_stats_bar(data):
         st.markdown(f"""
             <div class="metric-card">
                 <div class="metric-value" style="color: {color};">{overdue}</div>
-                <div class="metric-label">Overdue</div>
+                <div class="metric-label">Overdue • {due_soon} due in {DUE_SOON_DAYS}d</div>
             </div>
         """, unsafe_allow_html=True)
 
-def render_task(task, is_high_priority=False):
-    """Render a single task card."""
-    status = task.get('status', 'pending')
-    priority = task.get('priority', 'normal')
-    
-    card_class = "task-card"
-    if status == 'done':
-        card_class += " done"
-    elif status == 'in-progress':
-        card_class += " in-progress"
-    elif priority == 'high':
-        card_class += " high"
+def shown_rows(list_key):
+    """Number of rows of a paginated list this session has asked to see."""
+    return st.session_state.get(f"shown_{list_key}", PAGE_SIZES[list_key])
+
+def _show_more(list_key):
+    st.session_state[f"shown_{list_key}"] = shown_rows(list_key) + PAGE_SIZES[list_key]
+
+def _show_less(list_key):
+    st.session_state.pop(f"shown_{list_key}", None)
+
+def take_rows(rows, list_key, cursor, count):
+    """Return (first `count` rows of a list, whether more exist).
+
+    Rows past the end of the local list come from upstream pages via the
+    list's cursor, fetched only when the session asks to see them.
+    """
+    taken = list(rows[:count])
+    if len(rows) > count:
+        return taken, True
+    while len(taken) < count and cursor:
+        try:
+            items, cursor = fetch_list_page(list_key, cursor)
+        except Exception:
+            return taken, False  # Upstream paging is best-effort
+        needed = count - len(taken)
+        if len(items) > needed:
+            return taken + list(items[:needed]), True
+        taken = taken + list(items)
+    return taken, cursor is not None
+
+@timed
+def render_pager(list_key, has_more):
+    """Render the "Load more" / "Show less" controls under a paginated list."""
+    can_collapse = shown_rows(list_key) > PAGE_SIZES[list_key]
+    if not (has_more or can_collapse):
+        return
     
-    status_emoji = {
-        'done': '✅',
-        'in-progress': '🔄',
-        'pending': '⏳'
-    }.get(status, '⏳')
+    col1, col2 = st.columns(2)
+    with col1:
+        if has_more:
+            st.button("⬇️ Load more", key=f"more_{list_key}", on_click=_show_more,
+                      args=(list_key,), use_container_width=True)
+    with col2:
+        if can_collapse:
+            st.button("⬆️ Show less", key=f"less_{list_key}", on_click=_show_less,
+                      args=(list_key,), use_container_width=True)
+
+@timed
+def render_section(header_html, items_html, section=None, version=None):
+    """Render a list section (header + item cards) according to RENDER_MODE.
+
+    In "batched" mode the header and every item go out as one HTML block, so the
+    section costs a single delta regardless of list length. "per-item" mode
+    sends one st.markdown per item, as the dashboard originally did.
+    
+    items_html may be a callable returning the list. When a section name and
+    the version of the snapshot it was built from are given, the batched HTML
+    is built once per version (and minute, for relative times) and shared by
+    every session.
+    """
+    def build_items():
+        return items_html() if callable(items_html) else items_html
+    
+    if RENDER_MODE == "per-item":
+        st.markdown(header_html, unsafe_allow_html=True)
+        for item_html in build_items():
+            st.markdown(item_html, unsafe_allow_html=True)
+        return
     
-    priority_badge = "🔥 " if priority == 'high' else ""
+    def build():
+        # Dedent each piece on its own, as st.markdown would for a single call
+        blocks = [textwrap.dedent(html).strip() for html in [header_html, *build_items()]]
+        return "\n".join(blocks)
     
-    st.markdown(f"""
-        <div class="{card_class}">
-            <div class="task-title">{priority_badge}{task.get('title', 'Untitled')}</div>
-            <div class="task-meta">
-                {status_emoji} {status.replace('-', ' ').title()}
-                {' • Due: ' + task.get('due', '')[:10] if task.get('due') else ''}
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+    if version is None:
+        html = build()
+    else:
+        key = (section, version, render_clock())
+        html = get_section_cache().get_or_set(key, build)
+    st.markdown(html, unsafe_allow_html=True)
 
-def render_tasks_column(tasks, title, emoji, color_class):
-    """Render a column of tasks."""
-    active_tasks = [t for t in tasks if t.get('status') != 'done']
-    
-    st.markdown(f"""
+def task_card_html(task):
+    """Build the HTML for a single task card."""
+    return get_card_renderer().render("task", task)
+
+@timed
+def render_task(task, is_high_priority=False):
+    """Render a single task card."""
+    st.markdown(task_card_html(task), unsafe_allow_html=True)
+
+@timed
+def render_tasks_column(active_tasks, title, emoji, color_class, version=None, total=None):
+    """Render a column of open tasks (total defaults to len(active_tasks))."""
+    total = len(active_tasks) if total is None else total
+    header_html = f"""
         <div class="section-header {color_class}">
-            {emoji} {title} <span style="background: rgba(255,255,255,0.1); padding: 2px 8px; border-radius: 10px; font-size: 0.8rem; margin-left: 5px;">{len(active_tasks)}</span>
+            {emoji} {title} <span style="background: rgba(255,255,255,0.1); padding: 2px 8px; border-radius: 10px; font-size: 0.8rem; margin-left: 5px;">{total}</span>
         </div>
-    """, unsafe_allow_html=True)
+    """
     
     if not active_tasks:
+        st.markdown(header_html, unsafe_allow_html=True)
         st.info("✨ All clear!")
     else:
-        for task in active_tasks[:10]:
-            render_task(task)
+        render_section(
+            header_html, lambda: [task_card_html(task) for task in active_tasks],
+            section=("tasks", title, len(active_tasks)), version=version,
+        )
 
-def render_activity_log(activity):
-    """Render the activity log."""
-    st.markdown('<div class="section-header">📊 Activity</div>', unsafe_allow_html=True)
+@timed
+def render_activity_log(activity, version=None, cursor=None):
+    """Render the activity log, one page at a time."""
+    header_html = '<div class="section-header">📊 Activity</div>'
     
     if not activity:
+        st.markdown(header_html, unsafe_allow_html=True)
         st.info("No activity")
         return
     
-    for item in activity[:8]:
-        st.markdown(f"""
-            <div class="activity-item">
-                <div>{item.get('action', '')}</div>
-                <div class="activity-time">{format_time_ago(item.get('time'))}</div>
-            </div>
-        """, unsafe_allow_html=True)
+    shown = shown_rows('activity')
+    rows, has_more = take_rows(activity, 'activity', cursor, shown)
+    cards = get_card_renderer()
+    render_section(header_html, lambda: [
+        cards.render("activity", item, time_ago=format_time_ago(item_time(item, 'time')))
+        for item in rows
+    ], section=("activity", shown), version=version)
+    render_pager('activity', has_more)
 
-def render_work_log(work_log):
-    """Render Charlie's work log."""
-    st.markdown('<div class="section-header">📋 Charlie\'s Work Log</div>', unsafe_allow_html=True)
+@timed
+def render_work_log(work_log, version=None, cursor=None):
+    """Render Charlie's work log, one page at a time."""
+    header_html = '<div class="section-header">📋 Charlie\'s Work Log</div>'
     
     if not work_log:
+        st.markdown(header_html, unsafe_allow_html=True)
         st.info("Work log will appear here")
         return
     
-    for item in work_log[:10]:
-        st.markdown(f"""
-            <div class="activity-item">
-                <div class="activity-time">{format_time_ago(item.get('time'))}</div>
-                <div>{item.get('action', '')}</div>
-            </div>
-        """, unsafe_allow_html=True)
+    shown = shown_rows('workLog')
+    rows, has_more = take_rows(work_log, 'workLog', cursor, shown)
+    cards = get_card_renderer()
+    render_section(header_html, lambda: [
+        cards.render("work_log", item, time_ago=format_time_ago(item_time(item, 'time')))
+        for item in rows
+    ], section=("work_log", shown), version=version)
+    render_pager('workLog', has_more)
 
-def render_reminders(reminders):
-    """Render scheduled reminders."""
-    st.markdown('<div class="section-header">⏰ Scheduled Reminders</div>', unsafe_allow_html=True)
+@timed
+def render_reminders(reminders, version=None):
+    """Render scheduled reminders, one page at a time."""
+    header_html = '<div class="section-header">⏰ Scheduled Reminders</div>'
     
     if not reminders:
+        st.markdown(header_html, unsafe_allow_html=True)
         st.info("No reminders set")
         return
     
-    for r in reminders[:5]:
-        st.markdown(f"""
+    shown = shown_rows('reminders')
+    render_section(header_html, lambda: [f"""
             <div class="activity-item">
                 <div style="color: #f59e0b; font-weight: 600;">⏰ {r.get('schedule', '')}</div>
                 <div>{r.get('text', '')}</div>
             </div>
-        """, unsafe_allow_html=True)
+        """ for r in reminders[:shown]], section=("reminders", shown), version=version)
+    render_pager('reminders', len(reminders) > shown)
 
+@timed
 def render_conversation(conversation):
     """Render last conversation summary."""
     st.markdown('<div class="section-header">💬 Last Conversation</div>', unsafe_allow_html=True)
@@ -612,27 +2799,36 @@ def render_conversation(conversation):
         <div style="background: rgba(255,255,255,0.05); padding: 15px; border-radius: 8px;">
             <div style="margin-bottom: 10px;">{topics_html}</div>
             <p style="color: #888; margin: 0;">{conversation.get('summary', '')}</p>
-            <div class="activity-time" style="margin-top: 8px;">{format_time_ago(conversation.get('time'))}</div>
+            <div class="activity-time" style="margin-top: 8px;">{format_time_ago(item_time(conversation, 'time'))}</div>
         </div>
     """, unsafe_allow_html=True)
 
-def render_sessions(sessions):
+def session_item_html(s):
+    """Build the HTML for one session / sub-agent row."""
+    type_emoji = {'cron': '🔄', 'thread': '💬'}.get(s.get('type'), '🧵')
+    return f"""
+            <div class="activity-item">
+                <div style="color: #f59e0b; font-weight: 600;">{type_emoji} {s.get('type', '')} {' • ' + s.get('tokens', '') if s.get('tokens') else ''}</div>
+                <div>{s.get('name', '')}</div>
+            </div>
+        """
+
+@timed
+def render_sessions(sessions, version=None):
     """Render active sessions."""
-    st.markdown('<div class="section-header">🧵 Sessions & Sub-agents</div>', unsafe_allow_html=True)
+    header_html = '<div class="section-header">🧵 Sessions & Sub-agents</div>'
     
     if not sessions:
+        st.markdown(header_html, unsafe_allow_html=True)
         st.info("No active sessions")
         return
     
-    for s in sessions:
-        type_emoji = {'cron': '🔄', 'thread': '💬'}.get(s.get('type'), '🧵')
-        st.markdown(f"""
-            <div class="activity-item">
-                <div style="color: #f59e0b; font-weight: 600;">{type_emoji} {s.get('type', '')} {' • ' + s.get('tokens', '') if s.get('tokens') else ''}</div>
-                <div>{s.get('name', '')}</div>
-            </div>
-        """, unsafe_allow_html=True)
+    render_section(
+        header_html, lambda: [session_item_html(s) for s in sessions],
+        section="sessions", version=version,
+    )
 
+@timed
 def render_quick_links():
     """Render quick action links."""
     st.markdown('<div class="section-header">🔗 Quick Actions</div>', unsafe_allow_html=True)
@@ -647,10 +2843,127 @@ def render_quick_links():
     for label, url in links:
         st.markdown(f'<a href="{url}" target="_blank" class="quick-link">{label}</a>', unsafe_allow_html=True)
 
+@timed
+def render_fetch_stats():
+    """Render upstream fetch counters in the sidebar."""
+    stats = get_snapshot_cache().flight.stats()
+    
+    with st.sidebar:
+        st.markdown('<div class="section-header">⚙️ Upstream Fetches</div>', unsafe_allow_html=True)
+        if not stats:
+            st.caption("No upstream calls yet")
+        for name, counts in stats.items():
+            if isinstance(name, str):  # Skip per-page keys of paginated lists
+                st.caption(f"{name}: {counts['calls']} calls • {counts['shared']} avoided (coalesced)")
+        
+        # Circuit state, p95 latency and current timeout per endpoint
+        for endpoint, breaker in get_http_client().breakers.items():
+            p95 = breaker.p95()
+            latency = f"p95 {p95 * 1000:.0f}ms" if p95 is not None else "p95 --"
+            icon = {"closed": "🟢", "half-open": "🟡", "open": "🔴"}[breaker.state]
+            st.caption(f"{icon} {endpoint}: {breaker.state} • {latency} • timeout {breaker.timeout():.1f}s")
+        
+        # Last transfer per endpoint: wire bytes, format and savings vs plain JSON
+        for endpoint, t in get_http_client().transfers.items():
+            st.caption(
+                f"📦 {endpoint}: {t['kind']} ({t['encoding']}) • {t['wire_bytes'] / 1024:.1f} KB "
+                f"• {t['saved']:.0%} saved • {t['decode_ms']:.1f} ms decode"
+            )
+
+def is_admin():
+    """True when the session logged in with the admin password."""
+    return st.session_state.get("is_admin", False)
+
+def cache_stats():
+    """{cache name: (hits, misses)} of the process-wide caches."""
+    caches = {
+        "snapshots": get_snapshot_cache(),
+        "cards": get_card_renderer().cache,
+        "sections": get_section_cache(),
+        "indexes": get_index_cache(),
+        "pages": get_page_cache(),
+    }
+    return {name: (cache.hits, cache.misses) for name, cache in caches.items()}
+
+def render_diagnostics():
+    """Render timing percentiles, counters and cache hit ratios (admins only)."""
+    if not is_admin():
+        return
+    metrics = get_metrics()
+    
+    with st.sidebar.expander("🩺 Diagnostics"):
+        st.caption(f"p50/p95/p99 over the last {metrics.window} calls • exported to {METRICS_FILE}")
+        st.dataframe(
+            [
+                {'timer': name, 'calls': t['count'], 'p50 ms': t['p50'] * 1000,
+                 'p95 ms': t['p95'] * 1000, 'p99 ms': t['p99'] * 1000}
+                for name, t in metrics.timers().items()
+            ],
+            hide_index=True,
+        )
+        st.dataframe(
+            [
+                {'cache': name, 'hits': hits, 'misses': misses,
+                 'hit ratio': f"{hits / (hits + misses):.0%}" if hits + misses else "--"}
+                for name, (hits, misses) in cache_stats().items()
+            ],
+            hide_index=True,
+        )
+        st.dataframe(
+            [{'counter': name, 'value': value} for name, value in metrics.counters().items()],
+            hide_index=True,
+        )
+
+# =============================================================================
+# LIVE PANELS
+# =============================================================================
+# Fragments that re-run on their own LIVE_REFRESH interval without rerunning
+# the page. They read the tasks snapshot themselves (instant from the cache,
+# which refreshes in the background) instead of taking it as an argument.
+
+@timed
+def render_owner_tasks(index, owner_key, title, emoji, color_class, version=None):
+    """Render one owner's paginated tasks column from a task index."""
+    shown = shown_rows(owner_key)
+    render_tasks_column(
+        index.active_tasks(owner_key, shown), title, emoji, color_class,
+        version, total=index.active_count(owner_key),
+    )
+    render_pager(owner_key, index.active_count(owner_key) > shown)
+
+@st.fragment(run_every=LIVE_REFRESH['tasks'])
+@timed
+def live_tasks_column(owner_key, title, emoji, color_class):
+    """Auto-refreshing tasks column for one owner ('forBrooke'/'forCharlie')."""
+    snapshot = fetch_snapshot("tasks")
+    if snapshot.payload:
+        render_owner_tasks(get_task_index(snapshot), owner_key, title, emoji, color_class, snapshot.version)
+
+@st.fragment(run_every=LIVE_REFRESH['activity'])
+@timed
+def live_activity_log():
+    """Auto-refreshing activity log."""
+    snapshot = fetch_snapshot("tasks")
+    if snapshot.payload:
+        payload = get_models("tasks", snapshot)
+        render_activity_log(
+            payload.get('activity', []), snapshot.version,
+            cursor=payload.get('cursors', {}).get('activity'),
+        )
+
+@st.fragment(run_every=LIVE_REFRESH['sessions'])
+@timed
+def live_sessions():
+    """Auto-refreshing sessions and sub-agents list."""
+    snapshot = fetch_snapshot("tasks")
+    if snapshot.payload:
+        render_sessions(get_models("tasks", snapshot).get('sessions', []), snapshot.version)
+
 # =============================================================================
 # GROWTH TAB COMPONENTS
 # =============================================================================
 
+@timed
 def render_workshop_countdown():
     """Render the workshop countdown widget."""
     days, hours = get_workshop_countdown()
@@ -679,6 +2992,7 @@ def render_workshop_countdown():
         </div>
     """, unsafe_allow_html=True)
 
+@timed
 def render_revenue_streams():
     """Render revenue streams section."""
     st.markdown('<div class="section-header">💰 Revenue Streams</div>', unsafe_allow_html=True)
@@ -705,6 +3019,7 @@ def render_revenue_streams():
             </div>
         """, unsafe_allow_html=True)
 
+@timed
 def render_audience_growth():
     """Render audience growth metrics."""
     st.markdown('<div class="section-header">📈 Audience Growth</div>', unsafe_allow_html=True)
@@ -730,6 +3045,7 @@ def render_audience_growth():
             </div>
         """, unsafe_allow_html=True)
 
+@timed
 def render_monthly_targets():
     """Render monthly targets."""
     st.markdown('<div class="section-header">🎯 To Hit $20K/month</div>', unsafe_allow_html=True)
@@ -748,6 +3064,7 @@ def render_monthly_targets():
 # YOUTUBE TAB COMPONENTS
 # =============================================================================
 
+@timed
 def render_youtube_stats(yt_data):
     """Render YouTube stats bar."""
     channel = yt_data.get('channel', {}) if yt_data else {}
@@ -770,9 +3087,51 @@ def render_youtube_stats(yt_data):
                 </div>
             """, unsafe_allow_html=True)
 
-def render_top_videos(yt_data):
+# Trend chart ranges as (lookback in seconds, rollup resolution)
+TREND_RANGES = {
+    "24h": (86400, "hour"),
+    "30d": (30 * 86400, "day"),
+    "1y": (365 * 86400, "week"),
+}
+
+@timed
+def render_channel_trends(yt_data):
+    """Render channel and top-video trend charts from the local metrics history."""
+    st.markdown('<div class="section-header youtube">📈 Trends</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        metric = st.radio(
+            "Metric", CHANNEL_METRICS, horizontal=True, key="trend_metric", label_visibility="collapsed",
+            format_func={'subscribers': "Subscribers", 'totalViews': "Total Views", 'views30d': "Views (30d)"}.get,
+        )
+    with col2:
+        span = st.radio("Range", list(TREND_RANGES), horizontal=True, key="trend_range", label_visibility="collapsed")
+    
+    lookback, resolution = TREND_RANGES[span]
+    start = time.time() - lookback
+    recorder = get_metrics_recorder()
+    
+    times, values = recorder.query(f"channel.{metric}", start, resolution=resolution)
+    if len(times) < 2:
+        st.caption("Trends appear once a few YouTube snapshots have been recorded.")
+        return
+    st.line_chart({"time": times.astype('datetime64[s]'), metric: values}, x="time", y=metric, height=220)
+    
+    # Views of the current top videos over the same range
+    chart = {"time": [], "views": [], "video": []}
+    for video in ((yt_data or {}).get('topVideos') or [])[:5]:
+        times, values = recorder.query(f"video.{video_key(video)}.views", start, resolution=resolution)
+        chart["time"].extend(times.astype('datetime64[s]'))
+        chart["views"].extend(values)
+        chart["video"].extend([video.get('title', '')[:40]] * len(times))
+    if chart["time"]:
+        st.line_chart(chart, x="time", y="views", color="video", height=220)
+
+@timed
+def render_top_videos(yt_data, version=None):
     """Render top performing videos."""
-    st.markdown('<div class="section-header youtube">🔥 Top Performing Videos</div>', unsafe_allow_html=True)
+    header_html = '<div class="section-header youtube">🔥 Top Performing Videos</div>'
     
     # Fallback data
     videos = [
@@ -784,24 +3143,18 @@ def render_top_videos(yt_data):
     ]
     
     if yt_data and yt_data.get('topVideos'):
-        videos = yt_data['topVideos'][:5]
+        videos = rank_videos(yt_data['topVideos'], 'views', 5, 'topVideos', version)
     
-    for v in videos:
-        st.markdown(f"""
-            <div class="video-item">
-                <div class="video-title">{v.get('title', '')}</div>
-                <div class="video-stats">
-                    👁️ {format_number(v.get('views', 0))} • 
-                    👍 {format_number(v.get('likes', 0))} • 
-                    💬 {format_number(v.get('comments', 0))} • 
-                    📅 {format_time_ago(v.get('publishedAt'))}
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+    cards = get_card_renderer()
+    render_section(header_html, lambda: [
+        cards.render("top_video", v, time_ago=format_time_ago(item_time(v, 'publishedAt')))
+        for v in videos
+    ], section="top_videos", version=version)
 
-def render_recent_videos(yt_data):
+@timed
+def render_recent_videos(yt_data, version=None):
     """Render recent videos."""
-    st.markdown('<div class="section-header youtube">📹 Recent Videos</div>', unsafe_allow_html=True)
+    header_html = '<div class="section-header youtube">📹 Recent Videos</div>'
     
     videos = [
         {"title": "Why Clawdbot could expose your credentials", "views": 120, "publishedAt": "2026-01-30"},
@@ -810,19 +3163,15 @@ def render_recent_videos(yt_data):
     ]
     
     if yt_data and yt_data.get('recentVideos'):
-        videos = yt_data['recentVideos'][:5]
+        videos = rank_videos(yt_data['recentVideos'], 'publishedAt', 5, 'recentVideos', version)
     
-    for v in videos:
-        st.markdown(f"""
-            <div class="video-item">
-                <div class="video-title">{v.get('title', '')}</div>
-                <div class="video-stats">
-                    👁️ {format_number(v.get('views', 0))} • 
-                    📅 {format_time_ago(v.get('publishedAt'))}
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+    cards = get_card_renderer()
+    render_section(header_html, lambda: [
+        cards.render("recent_video", v, time_ago=format_time_ago(item_time(v, 'publishedAt')))
+        for v in videos
+    ], section="recent_videos", version=version)
 
+@timed
 def render_content_ideas(yt_data):
     """Render content ideas."""
     st.markdown('<div class="section-header">💡 Content Ideas</div>', unsafe_allow_html=True)
@@ -845,24 +3194,15 @@ def render_content_ideas(yt_data):
             </div>
         """, unsafe_allow_html=True)
 
+@timed
 def render_competitors():
     """Render competitor watch."""
-    st.markdown('<div class="section-header youtube">👀 Competitor Watch</div>', unsafe_allow_html=True)
+    header_html = '<div class="section-header youtube">👀 Competitor Watch</div>'
     
-    for c in COMPETITORS:
-        st.markdown(f"""
-            <div class="competitor-item">
-                <div>
-                    <div class="competitor-name">{c['name']}</div>
-                    <div class="competitor-handle">{c['handle']}</div>
-                </div>
-                <div style="text-align: right;">
-                    <div class="competitor-subs">{c['subs']}</div>
-                    <div style="font-size: 0.75rem; color: #888;">{c['style']}</div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+    cards = get_card_renderer()
+    render_section(header_html, [cards.render("competitor", c) for c in COMPETITORS])
 
+@timed
 def render_youtube_links():
     """Render YouTube quick links."""
     st.markdown('<div class="section-header">🔗 YouTube Links</div>', unsafe_allow_html=True)
@@ -881,6 +3221,7 @@ def render_youtube_links():
 # DOCS TAB
 # =============================================================================
 
+@timed
 def render_docs_tab():
     """Render the docs tab."""
     col1, col2 = st.columns(2)
@@ -923,13 +3264,18 @@ def render_docs_tab():
 # AUTHENTICATION
 # =============================================================================
 
+@timed
 def check_password():
     """Returns `True` if the user had the correct password."""
     
     def password_entered():
         """Checks whether a password entered by the user is correct."""
-        if hmac.compare_digest(st.session_state["password"], st.secrets.get("password", "CharlieBot123@!")):
+        password = st.session_state["password"]
+        admin_password = st.secrets.get("admin_password")
+        is_admin = bool(admin_password) and hmac.compare_digest(password, admin_password)
+        if is_admin or hmac.compare_digest(password, st.secrets.get("password", "CharlieBot123@!")):
             st.session_state["password_correct"] = True
+            st.session_state["is_admin"] = is_admin
             del st.session_state["password"]  # Don't store the password
         else:
             st.session_state["password_correct"] = False
@@ -984,136 +3330,308 @@ def check_password():
 # MAIN APP
 # =============================================================================
 
-def main():
-    # Fetch data
-    data = fetch_tasks()
-    yt_data = fetch_youtube()
+@timed
+def render_dashboard_streaming():
+    """Cold-start dashboard: fill each panel as soon as its sections arrive.
+
+    With no snapshot to serve yet, the tasks payload is streamed and each
+    panel renders from the partial payload once every section it needs has
+    been parsed, in the order the webhook sends them. When the whole payload
+    is in, the page reruns so the live panels take over.
+    """
+    stats = st.empty()
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        brooke = st.empty()
+        conversation = st.empty()
     
-    # Render header
-    render_header(data)
+    with col2:
+        charlie = st.empty()
+        reminders = st.empty()
     
-    # Create tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Dashboard", "📈 Growth", "▶️ YouTube", "📁 Docs"])
+    with col3:
+        activity = st.empty()
+        st.markdown("<br>", unsafe_allow_html=True)
+        render_quick_links()
     
-    # =========================================================================
-    # DASHBOARD TAB
-    # =========================================================================
-    with tab1:
-        if data:
-            render_stats_bar(data)
-        
-        # Main grid
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            # Brooke's tasks
-            if data:
-                render_tasks_column(data.get('forBrooke', []), "For Brooke", "👩", "brooke")
-            
-            # Conversation summary
-            if data:
-                st.markdown("<br>", unsafe_allow_html=True)
-                render_conversation(data.get('conversation', {}))
-        
-        with col2:
-            # Charlie's tasks
-            if data:
-                render_tasks_column(data.get('forCharlie', []), "For Charlie", "🤖", "charlie")
-            
-            # Reminders
-            if data:
-                st.markdown("<br>", unsafe_allow_html=True)
-                render_reminders(data.get('reminders', []))
-        
-        with col3:
-            # Activity log
-            if data:
-                render_activity_log(data.get('activity', []))
-            
-            # Quick links
-            st.markdown("<br>", unsafe_allow_html=True)
-            render_quick_links()
-        
-        # Work log - full width
-        st.markdown("<hr style='border-color: rgba(255,255,255,0.1); margin: 20px 0;'>", unsafe_allow_html=True)
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if data:
-                render_work_log(data.get('workLog', []))
-        
-        with col2:
-            if data:
-                render_sessions(data.get('sessions', []))
-    
-    # =========================================================================
-    # GROWTH TAB
-    # =========================================================================
-    with tab2:
-        # Workshop countdown at top
-        render_workshop_countdown()
-        
-        # Stats bar
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown("""
-                <div class="metric-card">
-                    <div class="metric-value" style="color: #22c55e;">$1,470</div>
-                    <div class="metric-label">MRR (Membership)</div>
-                </div>
-            """, unsafe_allow_html=True)
-        with col2:
-            st.markdown("""
-                <div class="metric-card">
-                    <div class="metric-value" style="color: #f59e0b;">$20K</div>
-                    <div class="metric-label">Monthly Goal</div>
-                </div>
-            """, unsafe_allow_html=True)
-        with col3:
-            st.markdown("""
-                <div class="metric-card">
-                    <div class="metric-value" style="color: #ef4444;">7%</div>
-                    <div class="metric-label">Progress</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        # Main content
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            render_revenue_streams()
+    st.markdown("<hr style='border-color: rgba(255,255,255,0.1); margin: 20px 0;'>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        work_log = st.empty()
+    with col2:
+        sessions = st.empty()
+    
+    def conversation_panel(p):
+        st.markdown("<br>", unsafe_allow_html=True)
+        render_conversation(p['conversation'])
+    
+    def reminders_panel(p):
+        st.markdown("<br>", unsafe_allow_html=True)
+        render_reminders(p['reminders'])
+    
+    # (placeholder, sections it needs, render function of the partial payload)
+    panels = [
+        (stats, ('forBrooke', 'forCharlie'), lambda p: render_stats_bar(build_task_index(p))),
+        (brooke, ('forBrooke',), lambda p: render_owner_tasks(build_task_index(p), 'forBrooke', "For Brooke", "👩", "brooke")),
+        (charlie, ('forCharlie',), lambda p: render_owner_tasks(build_task_index(p), 'forCharlie', "For Charlie", "🤖", "charlie")),
+        (conversation, ('conversation',), conversation_panel),
+        (reminders, ('reminders',), reminders_panel),
+        (activity, ('activity',), lambda p: render_activity_log(p['activity'], cursor=p.get('cursors', {}).get('activity'))),
+        (work_log, ('workLog',), lambda p: render_work_log(p['workLog'], cursor=p.get('cursors', {}).get('workLog'))),
+        (sessions, ('sessions',), lambda p: render_sessions(p['sessions'])),
+    ]
+    
+    payload = {}
+    pending = list(panels)
+    for key, value in get_snapshot_cache().stream("tasks"):
+        payload[key] = value
+        for panel in [panel for panel in pending if all(k in payload for k in panel[1])]:
+            pending.remove(panel)
+            with panel[0].container():
+                panel[2](payload)
+    
+    if payload:
+        st.rerun()
+
+@timed
+def render_dashboard_page():
+    """Dashboard page: tasks, conversation, reminders, activity and logs."""
+    if get_snapshot_cache().peek("tasks") is None:
+        render_dashboard_streaming()
+        return
+    
+    snapshot = fetch_snapshot("tasks")
+    data = get_models("tasks", snapshot) if snapshot.payload else None
+    version = snapshot.version
+    
+    if data:
+        render_stats_bar(get_task_index(snapshot))
+    
+    # Main grid
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        # Brooke's tasks
+        live_tasks_column('forBrooke', "For Brooke", "👩", "brooke")
         
-        with col2:
-            render_audience_growth()
+        # Conversation summary
+        if data:
             st.markdown("<br>", unsafe_allow_html=True)
-            render_monthly_targets()
+            render_conversation(data.get('conversation', {}))
     
-    # =========================================================================
-    # YOUTUBE TAB
-    # =========================================================================
-    with tab3:
-        render_youtube_stats(yt_data)
-        
-        col1, col2 = st.columns([2, 1])
+    with col2:
+        # Charlie's tasks
+        live_tasks_column('forCharlie', "For Charlie", "🤖", "charlie")
         
-        with col1:
-            render_top_videos(yt_data)
+        # Reminders
+        if data:
             st.markdown("<br>", unsafe_allow_html=True)
-            render_content_ideas(yt_data)
+            render_reminders(data.get('reminders', []), version)
+    
+    with col3:
+        # Activity log
+        live_activity_log()
         
-        with col2:
-            render_recent_videos(yt_data)
-            st.markdown("<br>", unsafe_allow_html=True)
-            render_competitors()
-            st.markdown("<br>", unsafe_allow_html=True)
-            render_youtube_links()
+        # Quick links
+        st.markdown("<br>", unsafe_allow_html=True)
+        render_quick_links()
+    
+    # Work log - full width
+    st.markdown("<hr style='border-color: rgba(255,255,255,0.1); margin: 20px 0;'>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
     
-    # =========================================================================
-    # DOCS TAB
-    # =========================================================================
-    with tab4:
-        render_docs_tab()
+    with col1:
+        if data:
+            render_work_log(data.get('workLog', []), version, cursor=data.get('cursors', {}).get('workLog'))
+    
+    with col2:
+        live_sessions()
 
-if __name__ == "__main__":
-    if check_password():
+@timed
+def render_growth_page():
+    """Growth page: workshop countdown, revenue and audience growth."""
+    # Workshop countdown at top
+    render_workshop_countdown()
+    
+    # Stats bar
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown("""
+            <div class="metric-card">
+                <div class="metric-value" style="color: #22c55e;">$1,470</div>
+                <div class="metric-label">MRR (Membership)</div>
+            </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        st.markdown("""
+            <div class="metric-card">
+                <div class="metric-value" style="color: #f59e0b;">$20K</div>
+                <div class="metric-label">Monthly Goal</div>
+            </div>
+        """, unsafe_allow_html=True)
+    with col3:
+        st.markdown("""
+            <div class="metric-card">
+                <div class="metric-value" style="color: #ef4444;">7%</div>
+                <div class="metric-label">Progress</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    # Main content
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        render_revenue_streams()
+    
+    with col2:
+        render_audience_growth()
+        st.markdown("<br>", unsafe_allow_html=True)
+        render_monthly_targets()
+
+@timed
+def render_youtube_page():
+    """YouTube page: channel stats, videos, ideas and competitors."""
+    snapshot = fetch_snapshot("youtube")
+    yt_data = get_models("youtube", snapshot) if snapshot.payload else None
+    version = snapshot.version
+    
+    render_youtube_stats(yt_data)
+    render_channel_trends(yt_data)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        render_top_videos(yt_data, version)
+        st.markdown("<br>", unsafe_allow_html=True)
+        render_content_ideas(yt_data)
+    
+    with col2:
+        render_recent_videos(yt_data, version)
+        st.markdown("<br>", unsafe_allow_html=True)
+        render_competitors()
+        st.markdown("<br>", unsafe_allow_html=True)
+        render_youtube_links()
+
+# Pages as (render function, title, icon, url path, data sources it needs).
+# Only the active page runs, and only its sources are fetched; the header
+# always needs tasks for Charlie's status.
+PAGES = [
+    (render_dashboard_page, "Dashboard", "📊", "dashboard", ["tasks"]),
+    (render_growth_page, "Growth", "📈", "growth", ["tasks"]),
+    (render_youtube_page, "YouTube", "▶️", "youtube", ["tasks", "youtube"]),
+    (render_docs_tab, "Docs", "📁", "docs", ["tasks"]),
+]
+
+@timed
+def render_page_nav(pages):
+    """Render the row of page links that replaces the old tab bar."""
+    cols = st.columns(len(pages))
+    for col, page in zip(cols, pages):
+        with col:
+            st.page_link(page, use_container_width=True)
+
+# Source each page streams section by section on a cold start, rather than
+# waiting for the whole payload before rendering anything
+STREAMED_SOURCES = {
+    "Dashboard": "tasks",
+}
+
+@timed
+def main():
+    pages = [
+        st.Page(func, title=title, icon=icon, url_path=url_path, default=(i == 0))
+        for i, (func, title, icon, url_path, _) in enumerate(PAGES)
+    ]
+    page = st.navigation(pages, position="hidden")
+    sources = next(p[4] for p in PAGES if p[1] == page.title)
+    
+    # Fetch the active page's data (all sources concurrently); the page
+    # functions then read the same snapshots straight from the cache. A
+    # source the page streams is left to the page when nothing is cached.
+    streamed = STREAMED_SOURCES.get(page.title)
+    if streamed and get_snapshot_cache().peek(streamed) is not None:
+        streamed = None
+    prefetch = [name for name in sources if name != streamed]
+    if prefetch:
+        fetch_all(prefetch)
+    
+    # The header is filled in after the page, so a streamed page isn't held up
+    header = st.container()
+    render_page_nav(pages)
+    page.run()
+    
+    with header:
+        if fetch_tasks() is None and fetch_error("tasks"):
+            st.error(f"Failed to fetch tasks: {fetch_error('tasks')}")
+        for name in sources:
+            render_stale_notice(name)
+        render_header()
+    render_fetch_stats()
+    render_diagnostics()
+    get_metrics().write(METRICS_FILE, cache_stats())
+
+def profiled_main():
+    """Run main() under the profilers and show the report (?profile=1, admins only).
+
+    The query parameter is dropped once the run is profiled, so only the next
+    execution is. If main() reruns the script (st.rerun), the profile is
+    saved and the rerun shows its report instead of profiling again. While another session is being
+    profiled, main() runs unprofiled and the parameter is kept.
+    """
+    lock = get_profile_lock()
+    if not lock.acquire(blocking=False):
+        st.toast("Another profile is running - this run was not profiled")
         main()
+        return
+    try:
+        path = os.path.join(PROFILE_DIR, f"main-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+        report = profile_call(main, path)
+    finally:
+        lock.release()
+    del st.query_params["profile"]
+    
+    error = report.pop('error')
+    if isinstance(error, RerunException):
+        st.session_state["profile_report"] = report
+    if error is not None:
+        raise error
+    render_profile(report)
+
+def render_profile(report):
+    """Render a profile_call() report in an expander."""
+    with st.expander("🔬 Profile of this run", expanded=True):
+        st.caption(
+            f"Saved to {report['path']} (open with snakeviz or pstats) • "
+            f"peak traced memory {report['peak'] / 1024 / 1024:.1f} MB"
+        )
+        with open(report['path'], "rb") as f:
+            st.download_button("⬇️ Download .prof", f.read(), file_name=os.path.basename(report['path']))
+        st.markdown("**Top cumulative hotspots**")
+        st.code(report['hotspots'], language=None)
+        st.markdown("**Top allocation sites**")
+        st.dataframe(
+            [
+                {'site': site, 'KB': size / 1024, 'blocks': count}
+                for site, size, count in report['allocations']
+            ],
+            hide_index=True,
+        )
+
+if __name__ == "__main__":
+    trace = get_tracer().start()
+    try:
+        if check_password():
+            # A profiled run ending in st.rerun() leaves its report for the
+            # rerun, which still carries the query parameter: show, don't profile
+            profile_report = st.session_state.pop("profile_report", None)
+            if is_admin() and st.query_params.get("profile") == "1" and profile_report is None:
+                profiled_main()
+            else:
+                main()
+                if profile_report is not None:
+                    st.query_params.pop("profile", None)
+                    render_profile(profile_report)
+    finally:
+        if trace is not None:
+            get_tracer().finish(trace)
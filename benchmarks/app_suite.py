@@ -0,0 +1,230 @@
+"""
+App benchmark suite - script run time, elements, bytes and peak memory per page.
+
+Drives the whole app (app.py, logged in) headlessly with Streamlit's AppTest
+against a stub of the n8n webhooks (tools/mock_webhook.py serving plain JSON
+from a child process), for synthetic tasks and YouTube payloads of increasing
+size. For each payload size and page it reports:
+
+- first: the page's first run in a fresh session with nothing cached - it
+  fetches and decodes the page's payloads, builds their models and renders;
+  each page gets its own session, opened through st.switch_page;
+- rerun: the median of --repeat further runs, with the data cached;
+- the elements (deltas) the page sends and their serialized bytes;
+- the peak memory traced (tracemalloc) during the first run (traced in a
+  second cold start, so tracing doesn't slow the timed one) and a rerun.
+
+Results are compared against a JSON baseline, which the first run (or
+--update-baseline) writes. Timings and memory more than --tolerance above the
+baseline, more elements or over 5% more bytes are flagged as regressions and
+make the run exit with status 1.
+
+Usage:
+    python benchmarks/app_suite.py [--rows 10 1000 10000 100000] [--repeat 5]
+                                   [--baseline benchmarks/baseline.json] [--update-baseline]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from http.server import ThreadingHTTPServer
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "tools"))
+
+import mock_webhook
+from render_deltas import iter_elements
+
+# Pages of the app (url_path of each st.Page in app.PAGES, "" for the default)
+PAGES = {"Dashboard": "", "Growth": "growth", "YouTube": "youtube", "Docs": "docs"}
+
+# Growth over the baseline allowed per metric before it counts as a regression
+# (None: --tolerance); bytes vary a little with the relative-time labels
+METRICS = {"first_ms": None, "rerun_ms": None, "elements": 0, "bytes": 0.05, "first_peak_mb": None, "peak_mb": None}
+
+
+def serve_stub(rows, ready):
+    """Child process: serve synthetic webhook payloads with `rows` entries per list."""
+    rng = random.Random(0)
+    sources = {
+        'tasks': mock_webhook.Source(mock_webhook.tasks_payload(rows, rng)),
+        'charlie-youtube': mock_webhook.Source(mock_webhook.youtube_payload(rows, rng, listed=rows)),
+    }
+
+    class Handler(mock_webhook.make_handler(sources, plain=True)):
+        def log_transfer(self, *args):
+            pass  # Keep the report readable
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    ready.send(server.server_port)
+    server.serve_forever()
+
+
+def start_stub(rows):
+    """Start the stub in a child process, keeping its work out of the timings and
+    traced memory; returns (process, port)."""
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve_stub, args=(rows, child), daemon=True)
+    process.start()
+    return process, parent.recv()
+
+
+def run_page(at):
+    """Run the app once; returns milliseconds taken."""
+    t0 = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - t0) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+
+def open_app(app_path, url_path):
+    """AppTest script: run the app on the page at `url_path`.
+
+    AppTest.switch_page() only resolves file-based pages and the app's pages
+    are callables, so the session's first run switches to the page with
+    st.switch_page() - as a page link would - before the app runs.
+    """
+    import runpy
+
+    import streamlit as st
+
+    if url_path and "bench_page" not in st.session_state:
+        st.session_state["bench_page"] = url_path
+        st.switch_page(st.Page(lambda: None, title=url_path, url_path=url_path))
+    runpy.run_path(app_path, run_name="__main__")
+
+
+def open_session(url_path, timeout):
+    """A logged-in session on the page at `url_path`, starting from nothing cached.
+
+    Clears the shared snapshots, models and rendered cards, and deletes the
+    snapshot store the app would otherwise restore them from.
+    """
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    if os.path.exists(os.environ["CHARLIE_SNAPSHOT_DB"]):
+        os.remove(os.environ["CHARLIE_SNAPSHOT_DB"])
+    at = AppTest.from_function(open_app, args=(os.path.join(REPO_ROOT, "app.py"), url_path), default_timeout=timeout)
+    at.session_state["password_correct"] = True
+    return at
+
+
+def traced_peak(fn):
+    """Peak megabytes traced (tracemalloc) while fn runs."""
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def measure(rows, repeat, timeout):
+    """Benchmark every page against payloads of `rows` entries; returns {page: metrics}."""
+    stub, port = start_stub(rows)
+    workdir = tempfile.mkdtemp(prefix="charlie-bench-")
+    os.environ.update({
+        "N8N_BASE_URL": f"http://127.0.0.1:{port}",
+        "CHARLIE_SNAPSHOT_DB": os.path.join(workdir, "snapshots.sqlite3"),
+        "CHARLIE_METRICS_FILE": os.path.join(workdir, "metrics.prom"),
+        "CHARLIE_TRACE_SAMPLE_RATE": "0",
+    })
+
+    results = {}
+    try:
+        for page, url_path in PAGES.items():
+            at = open_session(url_path, timeout)
+            first = run_page(at)
+            reruns = [run_page(at) for _ in range(repeat)]
+            elements = [el for root in (at.main, at.sidebar) for el in iter_elements(root)]
+            peak = traced_peak(lambda: run_page(at))
+            first_peak = traced_peak(lambda: run_page(open_session(url_path, timeout)))
+
+            results[page] = {
+                "first_ms": round(first, 1),
+                "rerun_ms": round(statistics.median(reruns), 1),
+                "elements": len(elements),
+                "bytes": sum(el.proto.ByteSize() for el in elements),
+                "first_peak_mb": first_peak,
+                "peak_mb": peak,
+            }
+    finally:
+        stub.terminate()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print results next to the baseline; returns the list of regressions."""
+    regressions = []
+    print(f"{'rows':>7}  {'page':<10} {'first ms':>16} {'rerun ms':>16} {'elements':>12} {'bytes':>14} "
+          f"{'first peak MB':>14} {'peak MB':>14}")
+    for rows, pages in results.items():
+        for page, metrics in pages.items():
+            before = baseline.get(rows, {}).get(page, {})
+            cells = []
+            for metric, allowed in METRICS.items():
+                value, old = metrics[metric], before.get(metric)
+                cell = f"{value:g}"
+                if old:
+                    change = value / old - 1
+                    cell += f" ({change:+.0%})"
+                    if change > (tolerance if allowed is None else allowed):
+                        regressions.append(f"{rows} rows, {page}: {metric} {old:g} -> {value:g}")
+                cells.append(cell)
+            print(f"{rows:>7}  {page:<10} {cells[0]:>16} {cells[1]:>16} {cells[2]:>12} {cells[3]:>14} "
+                  f"{cells[4]:>14} {cells[5]:>14}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1000, 10000, 100000], help="entries per list")
+    parser.add_argument("--repeat", type=int, default=5, help="reruns timed per page")
+    parser.add_argument("--baseline", default=os.path.join(REPO_ROOT, "benchmarks", "baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed growth of timings and memory (0.3: 30%%)")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per script run")
+    args = parser.parse_args()
+
+    results = {str(rows): measure(rows, args.repeat, args.timeout) for rows in args.rows}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.update_baseline or not baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "streamlit": st.__version__,
+                "machine": platform.machine(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Columnar benchmark - dict comprehensions vs TaskIndex vs NumPy TaskTable.
+
+For synthetic task and video lists of increasing size, times the stats bar
+and task column queries (open counts, done count, overdue, due soon, first
+10 open tasks) and the top/recent video rankings, split into the one-off
+build cost per snapshot and the per-rerun query cost. Each task row also
+shows how many reruns of one snapshot a TaskTable needs to pay back a cheaper
+build with its slower queries, which is what TASK_TABLE_MIN_ROWS and
+VIDEO_TABLE_MIN_ROWS in app.py are set from.
+
+Usage:
+    python benchmarks/columnar.py [--rows 1000 10000 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+NOW = time.time()
+
+
+def synthetic_payloads(rows, seed=0):
+    """Normalized tasks and YouTube payloads with `rows` tasks and videos."""
+    rng = random.Random(seed)
+    statuses = ['pending', 'in-progress', 'done']
+    tasks = {
+        owner: [
+            {
+                'title': f"Task {i}",
+                'status': rng.choice(statuses),
+                'priority': rng.choice(['high', 'normal']),
+                'dueEpoch': NOW + rng.uniform(-30, 30) * 86400 if rng.random() < 0.7 else None,
+            }
+            for i in range(rows // 2)
+        ]
+        for owner in app.TASK_OWNERS
+    }
+    videos = [
+        {
+            'title': f"Video {i}",
+            'views': rng.randint(0, 100000),
+            'likes': rng.randint(0, 1000),
+            'comments': rng.randint(0, 100),
+            'publishedAtEpoch': NOW - rng.uniform(0, 365) * 86400,
+        }
+        for i in range(rows)
+    ]
+    return tasks, videos
+
+
+def dict_queries(payload):
+    """The stats bar / task column queries as plain comprehensions per rerun."""
+    all_tasks = payload['forBrooke'] + payload['forCharlie']
+    active = {owner: [t for t in payload[owner] if t.get('status') != 'done'] for owner in app.TASK_OWNERS}
+    done = len([t for t in all_tasks if t.get('status') == 'done'])
+    overdue = soon = 0
+    for task in all_tasks:
+        due = task.get('dueEpoch')
+        if task.get('status') != 'done' and due is not None:
+            overdue += due < NOW
+            soon += NOW <= due <= NOW + 7 * 86400
+    return [len(active[o]) for o in app.TASK_OWNERS], done, overdue, soon, [t['title'] for t in active['forBrooke'][:10]]
+
+
+def index_queries(index):
+    return (
+        [index.active_count(o) for o in app.TASK_OWNERS],
+        index.done,
+        index.overdue(NOW),
+        index.due_within(7, NOW),
+        [t['title'] for t in index.active_tasks('forBrooke', 10)],
+    )
+
+
+def timed(fn, *args, repeat=5):
+    """Best-of-n wall time in milliseconds, plus the last result."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="tasks and videos per payload")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'tasks':<10} {'build':>10} {'query':>10}   {'videos':<10} {'build':>10} {'top+recent':>11}")
+    for rows in args.rows:
+        payload, videos = synthetic_payloads(rows)
+
+        dict_ms, expected = timed(dict_queries, payload)
+        index_build, index = timed(app.TaskIndex, payload)
+        index_ms, index_result = timed(index_queries, index)
+        table_build, table = timed(app.TaskTable, payload)
+        table_ms, table_result = timed(index_queries, table)
+        assert expected == index_result == table_result
+
+        def ranked_heapq():
+            return app.rank_videos(videos, 'views', 5), app.rank_videos(videos, 'publishedAt', 5)
+
+        def ranked_table(video_table):
+            return video_table.top('views', 5), video_table.top('publishedAt', 5)
+
+        heap_ms, heap_result = timed(ranked_heapq)
+        video_build, video_table = timed(app.VideoTable, videos)
+        argsort_ms, table_videos = timed(ranked_table, video_table)
+        assert [v['views'] for v in heap_result[0]] == [v['views'] for v in table_videos[0]]
+
+        print(f"{rows:>8}  {'dicts':<10} {'-':>10} {dict_ms:>8.2f}ms   {'heapq':<10} {'-':>10} {heap_ms:>9.2f}ms")
+        print(f"{'':>8}  {'TaskIndex':<10} {index_build:>8.2f}ms {index_ms:>8.3f}ms")
+        print(f"{'':>8}  {'TaskTable':<10} {table_build:>8.2f}ms {table_ms:>8.3f}ms   {'VideoTable':<10} {video_build:>8.2f}ms {argsort_ms:>9.2f}ms")
+        reruns = (index_build - table_build) / (table_ms - index_ms) if table_ms != index_ms else float('inf')
+        if table_build >= index_build:
+            verdict = "never pays off" if table_ms >= index_ms else f"pays off above {reruns:.0f} reruns per snapshot"
+        else:
+            verdict = "always pays off" if table_ms <= index_ms else f"pays off below {reruns:.0f} reruns per snapshot"
+        picked = type(app.build_task_index(payload)).__name__
+        print(f"{'':>8}  TaskTable {verdict}; build_task_index picks {picked}")
+
+
+if __name__ == "__main__":
+    main()
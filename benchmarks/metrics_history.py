@@ -0,0 +1,104 @@
+"""
+Metrics history benchmark - append and range-query cost of the YouTube series.
+
+Simulates a year (by default) of YouTube snapshots fetched every 5 minutes,
+each carrying channel stats plus per-video views/likes/comments, then times
+recording them into a MetricsRecorder and answering the trend chart queries
+(channel metric and top-video views over 24h/30d/1y) at each resolution.
+It first checks that a metric which stopped changing still charts over every
+range, and exits with status 1 if not.
+
+Usage:
+    python benchmarks/metrics_history.py [--days 365] [--videos 20] [--interval 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+def synthetic_snapshots(days, videos, interval, seed=0):
+    """Yield (fetched_at, payload) for a channel slowly gaining views and subscribers."""
+    rng = random.Random(seed)
+    start = time.time() - days * 86400
+    subscribers, total_views = 300, 150000
+    views = [rng.randint(100, 3000) for _ in range(videos)]
+    for i in range(int(days * 86400 / interval)):
+        if rng.random() < 0.05:
+            subscribers += 1
+        gained = [rng.randint(0, 3) for _ in range(videos)]
+        views = [v + g for v, g in zip(views, gained)]
+        total_views += sum(gained)
+        yield start + i * interval, {
+            'channel': {'subscribers': subscribers, 'totalViews': total_views, 'views30d': 5000 + i % 500},
+            'topVideos': [
+                {'id': f"video-{n}", 'views': v, 'likes': v // 50, 'comments': v // 200}
+                for n, v in enumerate(views)
+            ],
+        }
+
+
+def check_flat_series():
+    """Exit unless a flat metric spans each trend range with its current value."""
+    now = time.time()
+    recorder = app.MetricsRecorder()
+    recorder.record({'channel': {'subscribers': 300}}, now - 3 * 86400)
+    recorder.record({'channel': {'subscribers': 310}}, now - 2 * 86400)  # Flat ever since
+    for span, (lookback, resolution) in app.TREND_RANGES.items():
+        times, values = recorder.query("channel.subscribers", now - lookback, now, resolution=resolution)
+        # From the range start (or the first snapshot, if later) to now
+        if len(times) < 2 or times[0] > max(now - lookback, now - 3 * 86400) or times[-1] != int(now) or values[-1] != 310:
+            sys.exit(f"{span} query of a flat series returned {list(zip(times, values))}")
+    print("Flat series check: unchanged metrics span every trend range\n")
+
+
+def time_queries(recorder, repeat=200):
+    """Mean milliseconds per chart query for each trend range."""
+    now = time.time()
+    results = {}
+    for span, (lookback, resolution) in app.TREND_RANGES.items():
+        for key in ("channel.totalViews", "video.video-0.views"):
+            for res in ("raw", resolution):
+                t0 = time.perf_counter()
+                for _ in range(repeat):
+                    times, _ = recorder.query(key, now - lookback, resolution=res)
+                results[(span, key, res)] = ((time.perf_counter() - t0) / repeat * 1000, len(times))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--days", type=float, default=365)
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--interval", type=int, default=300, help="seconds between snapshots")
+    args = parser.parse_args()
+
+    check_flat_series()
+    snapshots = list(synthetic_snapshots(args.days, args.videos, args.interval))
+    recorder = app.MetricsRecorder()
+    t0 = time.perf_counter()
+    for fetched_at, payload in snapshots:
+        recorder.record(payload, fetched_at)
+    elapsed = time.perf_counter() - t0
+
+    series = recorder.keys()
+    points = sum(len(recorder._series[key].raw) for key in series)
+    samples = len(snapshots) * (len(app.CHANNEL_METRICS) + args.videos * len(app.VIDEO_METRICS))
+    print(f"{len(snapshots):,} snapshots, {len(series)} series: {samples:,} samples -> {points:,} stored points")
+    print(f"record: {elapsed * 1e6 / len(snapshots):.1f} us/snapshot, "
+          f"{recorder.nbytes / 1024:.0f} KiB in memory (raw + rollups)")
+    print()
+    print(f"{'range':>5}  {'series':<22} {'resolution':<10} {'points':>7}  {'ms/query':>8}")
+    for (span, key, res), (ms, n) in time_queries(recorder).items():
+        print(f"{span:>5}  {key:<22} {res:<10} {n:>7}  {ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Model memory benchmark - per-session copies vs shared slotted models.
+
+For synthetic tasks payloads of increasing size, measures with tracemalloc:
+
+- the size of the payload items as dicts vs as slotted models (Task,
+  ActivityEntry, Reminder, Session);
+- what one rerun of one session allocates to get the data and key the
+  visible cards: the st.cache_data approach (unpickle a fresh copy of the
+  payload, hash each card's dict) vs the shared models (no copy, digests
+  memoized on the first rerun);
+- the total over a number of concurrent sessions.
+
+Before measuring, it checks that models built by one execution of app.py
+keep their memoized digests in the next one (Streamlit re-executes the
+script on every rerun, so cached models belong to an earlier run's classes).
+
+Usage:
+    python benchmarks/models_memory.py [--rows 1000 10000 100000] [--sessions 10]
+"""
+
+import argparse
+import os
+import pickle
+import random
+import runpy
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+# Rows each list renders on a rerun (the first page of every paginated list)
+VISIBLE = dict(app.PAGE_SIZES, sessions=20)
+
+
+def synthetic_payload(rows, seed=0):
+    """A normalized tasks payload with `rows` items in each list section."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+
+    def iso(minutes):
+        return (now - timedelta(minutes=minutes)).isoformat().replace('+00:00', 'Z')
+
+    payload = {'lastUpdated': iso(1)}
+    for owner in app.TASK_OWNERS:
+        payload[owner] = [
+            {
+                'title': f"Task {owner} {i}",
+                'status': rng.choice(['pending', 'in-progress', 'done']),
+                'priority': rng.choice(['high', 'normal']),
+                'due': iso(-rng.randint(-50000, 50000)),
+            }
+            for i in range(rows)
+        ]
+    for key in ('activity', 'workLog'):
+        payload[key] = [{'action': f"{key} entry {i}", 'time': iso(i)} for i in range(rows)]
+    payload['reminders'] = [{'schedule': "9am", 'text': f"Reminder {i}"} for i in range(rows)]
+    payload['sessions'] = [{'type': 'cron', 'name': f"job {i}", 'tokens': "1k"} for i in range(rows)]
+    return app.normalize_timestamps(payload)
+
+
+def allocated(fn):
+    """(result, bytes still allocated after fn, peak bytes during fn)."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - before, peak - before
+
+
+def card_keys(data):
+    """Cache keys of the cards one rerun renders (first page of each list)."""
+    return [app.item_hash(item) for key, n in VISIBLE.items() for item in data[key][:n]]
+
+
+def check_across_reruns(payload):
+    """Exit unless a second execution of app.py keys cached models by their digest."""
+    rerun = runpy.run_path(app.__file__)  # What a rerun does: fresh Model/Task classes
+    task = app.build_models("tasks", payload)['forBrooke'][0]
+    if isinstance(task, rerun['Model']) or rerun['item_hash'](task) != task.digest:
+        sys.exit("item_hash() does not use the digest of models from an earlier script run")
+    print("Cross-rerun check: models from an earlier run are keyed by their memoized digest\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="items per list section")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions rerunning")
+    args = parser.parse_args()
+
+    check_across_reruns(synthetic_payload(10))
+    print(f"{'rows':>8}  {'items as dicts':>14} {'as models':>10} {'build':>9}   "
+          f"{'per rerun: copy':>15} {'shared':>9}   {f'x{args.sessions} sessions: copy':>22} {'shared':>9}")
+    for rows in args.rows:
+        payload = synthetic_payload(rows)
+        pickled = pickle.dumps(payload)
+        sections = app.MODEL_SECTIONS["tasks"]
+
+        _, dict_bytes, _ = allocated(lambda: {key: [dict(item) for item in payload[key]] for key in sections})
+        models, model_bytes, _ = allocated(lambda: app.build_models("tasks", payload))
+        t0 = time.perf_counter()
+        app.build_models("tasks", payload)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        def rerun_copy():
+            data = pickle.loads(pickled)  # st.cache_data hands each rerun a fresh copy
+            return data, card_keys(data)
+
+        def rerun_shared():
+            return models, card_keys(models)
+
+        rerun_shared()  # The first rerun memoizes the visible cards' digests
+        _, _, copy_peak = allocated(rerun_copy)
+        _, _, shared_peak = allocated(rerun_shared)
+
+        mib = 1024 * 1024
+        print(f"{rows:>8}  {dict_bytes / mib:>12.1f}MB {model_bytes / mib:>8.1f}MB {build_ms:>7.0f}ms   "
+              f"{copy_peak / mib:>13.2f}MB {shared_peak / 1024:>7.1f}KB   "
+              f"{copy_peak * args.sessions / mib:>20.1f}MB {shared_peak * args.sessions / 1024:>7.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
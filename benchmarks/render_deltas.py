@@ -0,0 +1,88 @@
+"""
+Render delta benchmark - deltas and bytes per rerun, batched vs per-item.
+
+Renders the dashboard's list sections headlessly with Streamlit's AppTest
+against a synthetic payload, once per RENDER_MODE, and reports how many
+elements (deltas) reach the browser and their serialized size.
+
+Usage:
+    python benchmarks/render_deltas.py [--items 50]
+"""
+
+import argparse
+import os
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def render_sections(repo_root, mode, payload, yt_payload):
+    """AppTest script: render every list section of the app in one rerun."""
+    import sys
+    sys.path.insert(0, repo_root)
+    import app
+
+    app.RENDER_MODE = mode
+    app.render_tasks_column(payload['forBrooke'], "For Brooke", "👩", "brooke")
+    app.render_tasks_column(payload['forCharlie'], "For Charlie", "🤖", "charlie")
+    app.render_activity_log(payload['activity'])
+    app.render_work_log(payload['workLog'])
+    app.render_reminders(payload['reminders'])
+    app.render_sessions(payload['sessions'])
+    app.render_top_videos(yt_payload)
+    app.render_recent_videos(yt_payload)
+    app.render_competitors()
+
+
+def synthetic_payloads(n):
+    """Build tasks and YouTube payloads with n entries per list."""
+    time = "2026-01-28T10:00:00Z"
+    payload = {
+        'forBrooke': [{'title': f"Brooke task {i}", 'status': 'pending', 'due': "2026-02-01"} for i in range(n)],
+        'forCharlie': [{'title': f"Charlie task {i}", 'status': 'in-progress', 'priority': 'high'} for i in range(n)],
+        'activity': [{'action': f"Did thing {i}", 'time': time} for i in range(n)],
+        'workLog': [{'action': f"Worked on {i}", 'time': time} for i in range(n)],
+        'reminders': [{'schedule': "Mon 9am", 'text': f"Reminder {i}"} for i in range(n)],
+        'sessions': [{'type': 'cron', 'name': f"job-{i}", 'tokens': "12k"} for i in range(n)],
+    }
+    videos = [{'title': f"Video {i}", 'views': 1000 + i, 'likes': i, 'comments': i, 'publishedAt': time} for i in range(n)]
+    return payload, {'topVideos': videos, 'recentVideos': videos}
+
+
+def iter_elements(node):
+    """Yield every leaf element below a block of the element tree."""
+    if isinstance(node, Block):
+        for child in node.children.values():
+            yield from iter_elements(child)
+    else:
+        yield node
+
+
+def measure(mode, payload, yt_payload):
+    at = AppTest.from_function(render_sections, args=(REPO_ROOT, mode, payload, yt_payload), default_timeout=60)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    elements = list(iter_elements(at.main))
+    return len(elements), sum(el.proto.ByteSize() for el in elements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=50, help="entries per list in the synthetic payload")
+    args = parser.parse_args()
+
+    payload, yt_payload = synthetic_payloads(args.items)
+    results = {mode: measure(mode, payload, yt_payload) for mode in ("per-item", "batched")}
+
+    print(f"{'mode':<10} {'deltas':>8} {'bytes':>10}")
+    for mode, (deltas, size) in results.items():
+        print(f"{mode:<10} {deltas:>8} {size:>10}")
+    before, after = results["per-item"], results["batched"]
+    print(f"\nbatched sends {before[0] / after[0]:.1f}x fewer deltas and {before[1] - after[1]} fewer bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Timestamp benchmark - parse per render vs normalize once at ingest.
+
+Builds payloads with thousands of timestamped rows and times the legacy
+approach (fromisoformat + datetime.now() inside every relative label) against
+the current one (normalize_timestamps once when the payload arrives, then
+format_time_ago from epoch seconds and a single "now").
+
+Usage:
+    python benchmarks/timestamps.py [--rows 1000 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+
+import app
+
+
+def legacy_format_time_ago(iso_string):
+    """format_time_ago as it was before ingest-time normalization."""
+    if not iso_string:
+        return ""
+    try:
+        dt = datetime.fromisoformat(iso_string.replace('Z', '+00:00'))
+        now = datetime.now(pytz.UTC)
+        diff = now - dt
+        minutes = int(diff.total_seconds() / 60)
+        hours = int(diff.total_seconds() / 3600)
+        days = int(diff.total_seconds() / 86400)
+        if minutes < 1:
+            return "Just now"
+        elif minutes < 60:
+            return f"{minutes}m ago"
+        elif hours < 24:
+            return f"{hours}h ago"
+        elif days < 7:
+            return f"{days}d ago"
+        else:
+            return dt.strftime("%b %d")
+    except:
+        return ""
+
+
+def synthetic_payload(rows):
+    """Tasks payload whose activity/workLog rows repeat a realistic spread of timestamps."""
+    start = datetime(2026, 1, 28, tzinfo=pytz.UTC)
+    stamps = [(start - timedelta(minutes=7 * i)).isoformat().replace('+00:00', 'Z') for i in range(rows // 4 or 1)]
+    return {
+        'lastUpdated': stamps[0],
+        'activity': [{'action': f"Action {i}", 'time': stamps[i % len(stamps)]} for i in range(rows)],
+        'workLog': [{'action': f"Work {i}", 'time': stamps[i % len(stamps)]} for i in range(rows)],
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def legacy_render(payload):
+    for section in ('activity', 'workLog'):
+        for item in payload[section]:
+            legacy_format_time_ago(item.get('time'))
+
+
+def normalized_render(payload):
+    now = app.render_clock()
+    for section in ('activity', 'workLog'):
+        for item in payload[section]:
+            app.format_time_ago(app.item_time(item, 'time'), now)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="rows per section")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'legacy/rerun':>14} {'ingest (once)':>14} {'normalized/rerun':>17} {'speedup':>8}")
+    for rows in args.rows:
+        legacy = timed(legacy_render, synthetic_payload(rows))
+        app.parse_timestamp.cache_clear()
+        payload = synthetic_payload(rows)
+        ingest = timed(app.normalize_timestamps, payload)
+        normalized = timed(normalized_render, payload)
+        print(f"{rows:>8} {legacy:>12.1f}ms {ingest:>12.1f}ms {normalized:>15.1f}ms {legacy / normalized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Multi-session load generator for the dashboard.
+
+Opens N simulated browser sessions against a Streamlit server's websocket
+(/_stcore/stream), logs each one in and keeps it rerunning the page like a
+viewer would: a full rerun every --think seconds, plus the live panels'
+fragment reruns on the intervals the app asks for. For each number of
+sessions it reports the rerun latency percentiles (request sent until the
+run finished), failed runs, and the server's CPU use and resident memory.
+
+By default the app is started on a free port with its webhooks pointed at
+--n8n (run tools/mock_webhook.py there, with --latency/--error-rate to taste)
+and a throwaway secrets.toml holding --password. --url and --pid attach to a
+server that is already running instead.
+
+Requires the websockets package; psutil is used for CPU/RSS when installed
+(otherwise /proc, on Linux).
+
+Usage:
+    python tools/mock_webhook.py --port 8765 --latency 150 --jitter 50 &
+    python tools/load_test.py [--sessions 1 5 10 25 50] [--duration 30] [--think 5]
+                              [--n8n http://127.0.0.1:8765] [--page dashboard]
+                              [--url http://127.0.0.1:8501 --pid PID]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+try:
+    from websockets.asyncio.client import connect
+except ImportError:
+    sys.exit("tools/load_test.py needs the websockets package: pip install websockets")
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Password the app accepts when no secrets.toml sets one
+DEFAULT_PASSWORD = "CharlieBot123@!"
+
+# Seconds allowed for one script run before it counts as failed
+RUN_TIMEOUT = 60
+
+FINISHED = ForwardMsg.ScriptFinishedStatus
+
+
+def process_usage(pid):
+    """(CPU seconds, resident bytes) used by a process so far, or None if unavailable."""
+    if psutil:
+        try:
+            process = psutil.Process(pid)
+            cpu = process.cpu_times()
+            return cpu.user + cpu.system, process.memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()  # Fields after the command name
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")  # utime + stime
+        return cpu, int(fields[21]) * os.sysconf("SC_PAGE_SIZE")  # rss pages
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class Session:
+    """One simulated browser tab: a websocket, its script runs and their latencies."""
+
+    def __init__(self, ws_url, page):
+        self.ws_url = ws_url
+        self.page = page
+        self.latencies = {'rerun': [], 'fragment': []}
+        self.failures = 0
+        self.fragments = {}  # fragment id -> rerun interval (seconds)
+        self.password_widget = None
+        self._finished = asyncio.Queue()
+        self._ws = None
+        self._reader = None
+
+    async def open(self, password):
+        self._ws = await connect(self.ws_url, subprotocols=["streamlit"], max_size=None, open_timeout=RUN_TIMEOUT)
+        self._reader = asyncio.create_task(self._read())
+        await self.run()
+        if self.password_widget:
+            await self.run(widgets={self.password_widget: password})
+
+    async def close(self):
+        if self._reader:
+            self._reader.cancel()
+        if self._ws:
+            await self._ws.close()
+
+    async def _read(self):
+        async for data in self._ws:
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "script_finished":
+                self._finished.put_nowait(msg.script_finished)
+            elif kind == "auto_rerun":
+                self.fragments[msg.auto_rerun.fragment_id] = msg.auto_rerun.interval
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                if element.WhichOneof("type") == "text_input" and element.text_input.type == element.text_input.PASSWORD:
+                    self.password_widget = element.text_input.id
+
+    async def run(self, fragment_id="", widgets=None, record=None):
+        """Request a script (or fragment) run and wait for it to finish; returns seconds taken."""
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.query_string = ""
+        state.page_name = self.page
+        state.fragment_id = fragment_id
+        state.is_auto_rerun = bool(fragment_id)
+        for widget_id, value in (widgets or {}).items():
+            widget = state.widget_states.widgets.add()
+            widget.id = widget_id
+            widget.string_value = value
+
+        done = FINISHED.FINISHED_FRAGMENT_RUN_SUCCESSFULLY if fragment_id else FINISHED.FINISHED_SUCCESSFULLY
+
+        async def finished():
+            # Runs cut short by a rerun (st.rerun on a cold start) are waited through
+            while (status := await self._finished.get()) != done:
+                if status == FINISHED.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("script failed to compile")
+
+        while not self._finished.empty():
+            self._finished.get_nowait()  # Leftovers of a run that timed out
+        started = time.perf_counter()
+        await self._ws.send(msg.SerializeToString())
+        try:
+            await asyncio.wait_for(finished(), RUN_TIMEOUT)
+        except (asyncio.TimeoutError, RuntimeError):
+            self.failures += 1
+            return None
+        elapsed = time.perf_counter() - started
+        if record:
+            self.latencies[record].append(elapsed)
+        return elapsed
+
+    async def browse(self, until, think):
+        """Rerun the page every `think` seconds and each fragment on its interval, until `until`."""
+        next_rerun = time.monotonic() + think
+        next_fragment = {fragment_id: time.monotonic() + interval for fragment_id, interval in self.fragments.items()}
+        while (now := time.monotonic()) < until:
+            due = min([next_rerun, *next_fragment.values()])
+            if due > now:
+                await asyncio.sleep(min(due, until) - now)
+                continue
+            if next_rerun <= now:
+                await self.run(record="rerun")
+                next_rerun = time.monotonic() + think
+            for fragment_id, at in next_fragment.items():
+                if at <= time.monotonic():
+                    await self.run(fragment_id, record="fragment")
+                    next_fragment[fragment_id] = time.monotonic() + self.fragments[fragment_id]
+
+
+async def sample_usage(pid, samples, stop):
+    """Append (time, cpu seconds, rss) of pid to samples every half second until stop is set."""
+    while not stop.is_set():
+        usage = process_usage(pid)
+        if usage:
+            samples.append((time.monotonic(), *usage))
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def load_step(ws_url, pid, n, args):
+    """Run n sessions for args.duration seconds; returns their report row."""
+    sessions = [Session(ws_url, args.page) for _ in range(n)]
+    await asyncio.gather(*(session.open(args.password) for session in sessions))
+
+    samples, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_usage(pid, samples, stop)) if pid else None
+    # Spread the sessions' reruns over the think time, like viewers arriving at random
+    until = time.monotonic() + args.duration
+
+    async def browse(i, session):
+        await asyncio.sleep(args.think * i / n)
+        await session.browse(until, args.think)
+
+    await asyncio.gather(*(browse(i, session) for i, session in enumerate(sessions)))
+    stop.set()
+    if sampler:
+        await sampler
+    await asyncio.gather(*(session.close() for session in sessions))
+
+    reruns = [t * 1000 for s in sessions for t in s.latencies['rerun']]
+    fragments = [t * 1000 for s in sessions for t in s.latencies['fragment']]
+    row = {
+        'sessions': n,
+        'reruns': len(reruns),
+        'p50': percentile(reruns, 50),
+        'p95': percentile(reruns, 95),
+        'p99': percentile(reruns, 99),
+        'fragments': len(fragments),
+        'fragment p95': percentile(fragments, 95),
+        'failed': sum(s.failures for s in sessions),
+        'cpu %': float("nan"),
+        'rss MB': float("nan"),
+    }
+    if len(samples) >= 2:
+        (t0, cpu0, _), (t1, cpu1, _) = samples[0], samples[-1]
+        row['cpu %'] = (cpu1 - cpu0) / (t1 - t0) * 100
+        row['rss MB'] = max(rss for _, _, rss in samples) / 1024 / 1024
+    return row
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(args):
+    """Start app.py under streamlit on a free port; returns (process, base URL)."""
+    workdir = tempfile.mkdtemp(prefix="charlie-load-")
+    os.makedirs(os.path.join(workdir, ".streamlit"))
+    with open(os.path.join(workdir, ".streamlit", "secrets.toml"), "w") as f:
+        f.write(f'password = "{args.password}"\n')
+    port = free_port()
+    env = dict(
+        os.environ,
+        N8N_BASE_URL=args.n8n,
+        CHARLIE_SNAPSHOT_DB=os.path.join(workdir, "snapshots.sqlite3"),
+        CHARLIE_METRICS_FILE=os.path.join(workdir, "metrics.prom"),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(REPO_ROOT, "app.py"),
+         "--server.port", str(port), "--server.headless", "true", "--logger.level", "error"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(120):
+        try:
+            urllib.request.urlopen(f"{url}/_stcore/health", timeout=1)
+            return process, url
+        except OSError:
+            time.sleep(0.5)
+    process.kill()
+    sys.exit("Streamlit did not start")
+
+
+async def run(args, url, pid):
+    ws_url = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+    columns = ['sessions', 'reruns', 'p50', 'p95', 'p99', 'fragments', 'fragment p95', 'failed', 'cpu %', 'rss MB']
+    print(f"Rerun latency in ms over {args.duration:g}s per step, a rerun every {args.think:g}s per session")
+    print("  ".join(f"{c:>12}" for c in columns))
+    for n in args.sessions:
+        row = await load_step(ws_url, pid, n, args)
+        print("  ".join(f"{row[c]:>12.0f}" if isinstance(row[c], float) else f"{row[c]:>12}" for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25, 50], help="concurrent sessions per step")
+    parser.add_argument("--duration", type=float, default=30, help="seconds each step runs")
+    parser.add_argument("--think", type=float, default=5, help="seconds between full reruns of a session")
+    parser.add_argument("--page", default="", help="url path of the page to load (default: the dashboard)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--n8n", default="http://127.0.0.1:8765", help="webhook base URL for the started app")
+    parser.add_argument("--url", help="attach to a running app at this URL instead of starting one")
+    parser.add_argument("--pid", type=int, help="process id of the app given by --url, for CPU/RSS")
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        process, url = start_app(args)
+        pid = process.pid
+    try:
+        asyncio.run(run(args, url, pid))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Local stand-in for the n8n tasks and YouTube webhooks.
+
+Serves synthetic payloads at /webhook/tasks and /webhook/charlie-youtube and
+mutates them every few seconds (a task changes status, an activity entry is
+added, the channel gains views), so the dashboard's transport features can be
+exercised without n8n:
+
+- ETag / If-None-Match revalidation (304 when nothing changed);
+- content negotiation: MessagePack when the client accepts it and msgpack is
+  installed, brotli or gzip compression per Accept-Encoding;
+- delta mode: a request with X-Since-Version gets only the entries changed
+  since that version (X-Delta: 1), when that version is still known;
+- MessagePack and delta responses report the size of the full payload as
+  plain JSON in X-Json-Length, for the client's savings figures.
+
+--plain serves uncompressed JSON without versions, like the webhooks today.
+
+Instead of synthetic data, --record DIR saves the real webhooks' payloads
+(from N8N_BASE_URL or the production n8n) and --replay DIR serves them
+(unchanged: replayed payloads are not mutated). --scale N repeats every list
+of the payloads N times to test larger payloads.
+
+For load tests, --latency and --jitter delay every response (milliseconds,
+latency plus up to +/- jitter) and --error-rate answers that share of
+requests with a 503.
+
+Usage:
+    python tools/mock_webhook.py [--port 8765] [--rows 50] [--mutate-every 5] [--plain]
+                                 [--record DIR | --replay DIR] [--scale N]
+                                 [--latency MS] [--jitter MS] [--error-rate P]
+    N8N_BASE_URL=http://127.0.0.1:8765 streamlit run app.py --logger.level=info
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Versions kept per source to diff delta requests against
+HISTORY_SIZE = 20
+
+# Webhook names served, as in /webhook/<name>
+WEBHOOKS = ('tasks', 'charlie-youtube')
+
+# Where --record fetches the real payloads from
+UPSTREAM = os.environ.get("N8N_BASE_URL", "https://n8n-wrightmode-u50335.vm.elestio.app").rstrip("/")
+
+
+def iso(minutes_ago):
+    moment = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return moment.isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+
+def tasks_payload(rows, rng):
+    statuses = ['pending', 'in-progress', 'done']
+    return {
+        'lastUpdated': iso(0),
+        'charlieLastActive': iso(1),
+        'forBrooke': [
+            {'id': f"b{i}", 'title': f"Brooke task {i}", 'status': rng.choice(statuses),
+             'priority': rng.choice(['high', 'normal']), 'due': iso(rng.randint(-20000, 20000))}
+            for i in range(rows)
+        ],
+        'forCharlie': [
+            {'id': f"c{i}", 'title': f"Charlie task {i}", 'status': rng.choice(statuses), 'priority': 'normal'}
+            for i in range(rows)
+        ],
+        'activity': [{'id': f"a{i}", 'action': f"Activity {i}", 'time': iso(i * 7)} for i in range(rows)],
+        'workLog': [{'id': f"w{i}", 'action': f"Work item {i}", 'time': iso(i * 30)} for i in range(rows)],
+        'reminders': [{'id': f"r{i}", 'schedule': "Daily 9am", 'text': f"Reminder {i}"} for i in range(min(rows, 10))],
+        'sessions': [{'id': f"s{i}", 'type': rng.choice(['cron', 'thread']), 'name': f"Session {i}"} for i in range(5)],
+        'conversation': {'topics': ["dashboard", "performance"], 'summary': "Mock conversation", 'time': iso(3)},
+    }
+
+
+def youtube_payload(rows, rng, listed=10):
+    """Channel stats plus `rows` videos, `listed` of them in each video list."""
+    videos = [
+        {'id': f"v{i}", 'title': f"Video {i}", 'views': rng.randint(100, 5000),
+         'likes': rng.randint(0, 100), 'comments': rng.randint(0, 50), 'publishedAt': iso(i * 1440)}
+        for i in range(rows)
+    ]
+    return {
+        'channel': {'subscribers': 336, 'totalViews': 159443, 'videoCount': rows, 'views30d': 5210},
+        'topVideos': sorted(videos, key=lambda v: -v['views'])[:listed],
+        'recentVideos': videos[:listed],
+        'ideas': [{'title': "Mock idea", 'reason': "Testing", 'source': "mock"}],
+    }
+
+
+def diff(base, current):
+    """Delta document turning base into current (entries matched by id)."""
+    delta = {'set': {}, 'upsert': {}, 'remove': {}}
+    for key, value in current.items():
+        old = base.get(key)
+        if isinstance(value, list) and isinstance(old, list) and all('id' in item for item in value + old):
+            old_items = {item['id']: item for item in old}
+            upsert = [item for item in value if old_items.get(item['id']) != item]
+            removed = [item_id for item_id in old_items if item_id not in {item['id'] for item in value}]
+            if upsert:
+                delta['upsert'][key] = upsert
+            if removed:
+                delta['remove'][key] = removed
+        elif value != old:
+            delta['set'][key] = value
+    return delta
+
+
+def scale(payload, factor):
+    """Copy of payload with every list of items repeated factor times (ids kept unique)."""
+    if factor == 1:
+        return payload
+    scaled = {}
+    for key, value in payload.items():
+        if isinstance(value, dict):
+            value = scale(value, factor)
+        elif isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            value = value + [
+                dict(item, id=f"{item.get('id', i)}-x{n}")
+                for n in range(1, factor) for i, item in enumerate(value)
+            ]
+        scaled[key] = value
+    return scaled
+
+
+def record(directory):
+    """Save the current payload of every webhook upstream to directory/<name>.json."""
+    os.makedirs(directory, exist_ok=True)
+    for name in WEBHOOKS:
+        with urllib.request.urlopen(f"{UPSTREAM}/webhook/{name}", timeout=30) as response:
+            body = response.read()
+        with open(os.path.join(directory, f"{name}.json"), "wb") as f:
+            f.write(body)
+        print(f"Recorded {name}: {len(body)} bytes", file=sys.stderr)
+
+
+def replay(directory):
+    """{name: payload} of the webhooks recorded in directory."""
+    payloads = {}
+    for name in WEBHOOKS:
+        with open(os.path.join(directory, f"{name}.json")) as f:
+            payloads[name] = json.load(f)
+    return payloads
+
+
+class Faults:
+    """Latency, jitter and errors injected into responses."""
+
+    def __init__(self, latency=0, jitter=0, error_rate=0, seed=None):
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+
+    def delay(self):
+        """Sleep for the configured latency plus jitter."""
+        seconds = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def fail(self):
+        """Whether this request should fail."""
+        return self.rng.random() < self.error_rate
+
+
+class Source:
+    """One mock webhook: current payload, version and recent history."""
+
+    def __init__(self, payload):
+        self.lock = threading.Lock()
+        self.version = 1
+        self.payload = payload
+        self.history = OrderedDict({self.version: copy.deepcopy(payload)})
+
+    def update(self, mutate):
+        with self.lock:
+            mutate(self.payload)
+            self.version += 1
+            self.history[self.version] = copy.deepcopy(self.payload)
+            while len(self.history) > HISTORY_SIZE:
+                self.history.popitem(last=False)
+
+
+def mutate_tasks(rng):
+    counter = iter(range(10**9))
+
+    def mutate(payload):
+        task = rng.choice(payload['forBrooke'] + payload['forCharlie'])
+        task['status'] = rng.choice(['pending', 'in-progress', 'done'])
+        payload['activity'].insert(0, {'id': f"a-new{next(counter)}", 'action': f"Updated {task['title']}", 'time': iso(0)})
+        payload['lastUpdated'] = iso(0)
+    return mutate
+
+
+def mutate_youtube(rng):
+    def mutate(payload):
+        payload['channel']['totalViews'] += rng.randint(1, 50)
+        payload['channel']['subscribers'] += rng.random() < 0.3
+        for video in payload['topVideos']:
+            video['views'] += rng.randint(0, 5)
+    return mutate
+
+
+def make_handler(sources, plain, faults=None):
+    faults = faults or Faults()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            name = self.path.split('?')[0].rstrip('/').rsplit('/', 1)[-1]
+            source = sources.get(name)
+            if source is None:
+                self.send_error(404)
+                return
+            faults.delay()
+            if faults.fail():
+                self.send_error(503, "Injected failure")
+                self.log_transfer(name, 503, "-", "-", 0)
+                return
+            with source.lock:
+                version, payload = source.version, copy.deepcopy(source.payload)
+                since = self.headers.get('X-Since-Version')
+                base = source.history.get(int(since)) if since and since.isdigit() else None
+
+            etag = f'"v{version}"'
+            if not plain and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                self.log_transfer(name, 304, "-", "-", 0)
+                return
+
+            body_doc, delta = payload, False
+            if not plain and base is not None and int(since) != version:
+                body_doc, delta = dict(diff(base, payload), since=since), True
+
+            accept = self.headers.get('Accept', '')
+            if not plain and msgpack and 'application/msgpack' in accept:
+                body, content_type = msgpack.packb(body_doc), 'application/msgpack'
+            else:
+                body, content_type = json.dumps(body_doc).encode(), 'application/json'
+            # The full payload's plain JSON size, when the body isn't that
+            json_length = len(json.dumps(payload).encode()) if content_type != 'application/json' or delta else None
+
+            accept_encoding = self.headers.get('Accept-Encoding', '')
+            encoding = 'identity'
+            if not plain and brotli and 'br' in accept_encoding:
+                body, encoding = brotli.compress(body), 'br'
+            elif not plain and 'gzip' in accept_encoding:
+                body, encoding = gzip.compress(body), 'gzip'
+
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if encoding != 'identity':
+                self.send_header('Content-Encoding', encoding)
+            if not plain:
+                self.send_header('ETag', etag)
+                self.send_header('X-Payload-Version', str(version))
+            if delta:
+                self.send_header('X-Delta', '1')
+            if json_length is not None:
+                self.send_header('X-Json-Length', str(json_length))
+            self.end_headers()
+            self.wfile.write(body)
+            self.log_transfer(name, 200, content_type.split('/')[-1] + (" delta" if delta else ""), encoding, len(body))
+
+        def log_transfer(self, name, status, kind, encoding, size):
+            print(f"{time.strftime('%H:%M:%S')} {name} {status} {kind} {encoding} {size} bytes", file=sys.stderr)
+
+        def log_message(self, *args):
+            pass  # Replaced by log_transfer
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=50, help="items per list in the synthetic payloads")
+    parser.add_argument("--mutate-every", type=float, default=5, help="seconds between payload changes (0: never)")
+    parser.add_argument("--plain", action="store_true", help="plain JSON only: no versions, compression or deltas")
+    parser.add_argument("--record", metavar="DIR", help=f"save the payloads of {UPSTREAM} to DIR and exit")
+    parser.add_argument("--replay", metavar="DIR", help="serve the payloads recorded in DIR")
+    parser.add_argument("--scale", type=int, default=1, help="repeat every list of the payloads N times")
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0, help="random +/- milliseconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of requests answered with a 503 (0-1)")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+
+    rng = random.Random(0)
+    if args.replay:
+        payloads = replay(args.replay)
+        args.mutate_every = 0
+    else:
+        payloads = {'tasks': tasks_payload(args.rows, rng), 'charlie-youtube': youtube_payload(args.rows, rng)}
+    sources = {name: Source(scale(payload, args.scale)) for name, payload in payloads.items()}
+
+    def mutator():
+        mutations = {'tasks': mutate_tasks(rng), 'charlie-youtube': mutate_youtube(rng)}
+        while True:
+            time.sleep(args.mutate_every)
+            for name, source in sources.items():
+                source.update(mutations[name])
+
+    if args.mutate_every > 0:
+        threading.Thread(target=mutator, daemon=True).start()
+
+    faults = Faults(args.latency, args.jitter, args.error_rate)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(sources, args.plain, faults))
+    print(f"Mock n8n webhooks on http://127.0.0.1:{args.port}/webhook/{{tasks,charlie-youtube}}", file=sys.stderr)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()